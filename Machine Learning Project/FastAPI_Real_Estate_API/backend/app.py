@@ -1,17 +1,40 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel
+from typing import List
 import joblib
 import pickle
 import pandas as pd
 import numpy as np
 import sklearn
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
+from types import MappingProxyType
+from collections import OrderedDict
 import logging
+import hashlib
 import json
+import orjson
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Recommender top-k (optional Numba kernel, NumPy fallback), shared with the Streamlit recommender
+import similarity_topk
 
 # Plotly imports
 import plotly.express as px
@@ -20,7 +43,6 @@ from plotly.utils import PlotlyJSONEncoder
 
 # WordCloud imports
 from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 import io
 
 # Configure logging
@@ -34,10 +56,19 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATASET_PATH = os.path.join(BASE_DIR, "Dataset")
 frontend_path = os.path.join(BASE_DIR, "..", "frontend")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background tasks and warm caches before serving; stop the tasks on shutdown"""
+    await startup_event()
+    yield
+    await shutdown_event()
+
 app = FastAPI(
     title="Real Estate Analytics API",
     description="ML-powered real estate price prediction, analysis, and recommendation platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Serve frontend static files
@@ -61,6 +92,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Media types that are already compressed: gzipping them again costs CPU on every request for no gain
+INCOMPRESSIBLE_MEDIA_PREFIXES = ("image/",)
+
+class MediaAwareGZipResponder(GZipResponder):
+    """GZipResponder that passes already-compressed media (e.g. the wordcloud PNG) through unencoded"""
+
+    async def send_with_gzip(self, message):
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(INCOMPRESSIBLE_MEDIA_PREFIXES):
+                # The responder forwards the body untouched when the encoding is already decided
+                self.content_encoding_set = True
+
+class MediaAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips INCOMPRESSIBLE_MEDIA_PREFIXES responses"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = MediaAwareGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+# Gzip large JSON payloads (chart/analysis float arrays compress several times over)
+app.add_middleware(MediaAwareGZipMiddleware, minimum_size=1024)
+
+@app.exception_handler(Exception)
+async def general_exception_handler(request: Request, exc: Exception):
+    """Return unexpected errors as a JSON 500, so hot endpoints don't need their own try/except"""
+    logger.error(f"Unhandled error on {request.url.path}: {exc}")
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
+
 # Helper loader
 def load_pickle(filename):
     file_path = os.path.join(DATASET_PATH, filename)
@@ -72,16 +136,102 @@ def load_pickle(filename):
         with open(file_path, "rb") as f:
             return pickle.load(f)
 
+# Low-cardinality string columns stored as category: equality filters and groupbys
+# compare int codes instead of Python strings
+CATEGORICAL_COLUMNS = ["property_type", "sector", "balcony", "agePossession",
+                       "furnishing_type", "luxury_category", "floor_category"]
+
+def convert_categoricals(data):
+    """Convert the object-dtype CATEGORICAL_COLUMNS of a DataFrame to category dtype"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in data.columns and data[col].dtype == object:
+            data[col] = data[col].astype("category")
+    return data
+
+def load_location_df():
+    """Wrap the memory-mapped location_distance.npy in a DataFrame, else load the pickle"""
+    npy_path = os.path.join(DATASET_PATH, "location_distance.npy")
+    labels_path = os.path.join(DATASET_PATH, "location_labels.json")
+    if os.path.exists(npy_path) and os.path.exists(labels_path):
+        with open(labels_path) as f:
+            labels = json.load(f)
+        distances = np.load(npy_path, mmap_mode="r")
+        return pd.DataFrame(distances, index=pd.Index(labels["apartments"], name="PropertyName"),
+                            columns=labels["locations"], copy=False)
+    return load_pickle("location_distance.pkl")
+
+# Rows fused per block: each block's inputs and temporaries stay cache-sized, and blocks
+# are independent so they run on a thread pool (NumPy releases the GIL in the ufuncs)
+FUSE_BLOCK_ROWS = 512
+
+def fuse_cosine_matrices(sim1, sim2, sim3):
+    """Build 0.5*sim1 + 0.8*sim2 + 1.0*sim3 as one float32 matrix, fused in row blocks"""
+    combined = np.empty(np.shape(sim1), dtype=np.float32)
+
+    def fuse_block(start):
+        rows = slice(start, start + FUSE_BLOCK_ROWS)
+        block = combined[rows]
+        np.multiply(sim1[rows], 0.5, out=block, dtype=np.float32)
+        block += np.multiply(sim2[rows], 0.8, dtype=np.float32)
+        np.add(block, sim3[rows], out=block)
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(fuse_block, range(0, len(combined), FUSE_BLOCK_ROWS)))
+    return combined
+
+def load_cosine_combined():
+    """Memory-map the pre-fused float32 matrix written by convert_matrices.py, else fuse the three matrices"""
+    npy_path = os.path.join(DATASET_PATH, "cosine_sim_combined_f32.npy")
+    if os.path.exists(npy_path):
+        combined = np.load(npy_path, mmap_mode="r")
+    else:
+        combined = fuse_cosine_matrices(*(load_pickle(f"cosine_sim{i}.pkl") for i in (1, 2, 3)))
+    # Requests read one row: keep it a single contiguous float32 run (strides[0] == N * 4)
+    # so the top-k kernel and NumPy's SIMD loops get a unit-stride row. A conforming
+    # .npy stays memory-mapped; anything else (e.g. a Fortran-ordered file) is copied once.
+    if combined.dtype != np.float32 or not combined.flags["C_CONTIGUOUS"]:
+        combined = np.ascontiguousarray(combined, dtype=np.float32)
+    return combined
+
+def load_df():
+    """Load df.parquet written by convert_matrices.py (columnar, no object unpickling), else df.pkl"""
+    parquet_path = os.path.join(DATASET_PATH, "df.parquet")
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, engine="pyarrow")
+    return load_pickle("df.pkl")
+
+def load_data_viz():
+    """Load data_viz1.parquet written by convert_matrices.py, else the analysis CSV with its numeric columns coerced"""
+    parquet_path = os.path.join(DATASET_PATH, "data_viz1.parquet")
+    if os.path.exists(parquet_path):
+        return convert_categoricals(pd.read_parquet(parquet_path, engine="pyarrow"))
+    data = pd.read_csv(os.path.join(DATASET_PATH, "data_viz1.csv"))
+    num_cols = ["price", "price_per_sqft", "built_up_area", "latitude", "longitude"]
+    existing_num_cols = [col for col in num_cols if col in data.columns]
+    if existing_num_cols:
+        data[existing_num_cols] = data[existing_num_cols].apply(pd.to_numeric, errors="coerce")
+    return convert_categoricals(data)
+
+# Load all artifacts concurrently: they are independent disk reads + decompression,
+# and joblib/numpy release the GIL for most of that work
+with ThreadPoolExecutor(max_workers=4) as executor:
+    df_future = executor.submit(load_df)
+    pipeline_future = executor.submit(load_pickle, "pipeline_compressed.pkl")
+    location_future = executor.submit(load_location_df)
+    cosine_future = executor.submit(load_cosine_combined)
+    data_viz_future = executor.submit(load_data_viz)
+    feature_text_future = executor.submit(load_pickle, "feature_text.pkl")
+
 # Load dataset & pipeline
 try:
-    df = load_pickle("df.pkl")
+    df = convert_categoricals(df_future.result())
     logger.info(f"✅ df.pkl loaded with columns: {df.columns.tolist()}")
 except Exception as e:
     logger.error(f"❌ Error loading df.pkl: {e}")
     df = pd.DataFrame()
 
 try:
-    pipeline = load_pickle("pipeline_compressed.pkl")
+    pipeline = pipeline_future.result()
     logger.info("✅ Pipeline loaded successfully")
 except Exception as e:
     logger.error(f"❌ Error loading pipeline: {e}")
@@ -89,54 +239,213 @@ except Exception as e:
 
 # Load recommender data
 try:
-    location_df = load_pickle("location_distance.pkl")
+    location_df = location_future.result()
     logger.info(f"✅ Location data loaded with shape: {location_df.shape}")
 except Exception as e:
     logger.error(f"❌ Error loading location data: {e}")
     location_df = pd.DataFrame()
 
-# Load cosine similarity matrices for recommender system
+# Radius index for location search: every landmark column sorted once, so a query is a
+# binary search plus a slice. location_df holds distances to named landmarks, not
+# coordinates, so a spatial tree (k-d/ball tree) has nothing to index. Distances are
+# whole metres (up to float64 noise), so float32 holds them, and int32 positions halve the order array.
+LOCATION_ORDER = None
+LOCATION_SORTED = None
+LOCATION_SORTED_KM = None
+LOCATION_APARTMENTS = None
+# Name -> position dicts so handlers skip pandas Index lookups (labels are unique)
+APARTMENT_INDEX: dict = {}
+LOCATION_COLUMN_INDEX: dict = {}
+
+def load_location_index(shape):
+    """Memory-map location_order.npy / location_sorted.npy written by convert_matrices.py, else None.
+
+    Mapped read-only, so every Uvicorn worker shares the same page-cache pages instead of
+    holding its own sorted copy.
+    """
+    order_path = os.path.join(DATASET_PATH, "location_order.npy")
+    sorted_path = os.path.join(DATASET_PATH, "location_sorted.npy")
+    if not (os.path.exists(order_path) and os.path.exists(sorted_path)):
+        return None
+    order = np.load(order_path, mmap_mode="r")
+    distances = np.load(sorted_path, mmap_mode="r")
+    if order.shape != shape or distances.shape != shape:
+        logger.warning("⚠️ Location index files don't match location_df, rebuilding")
+        return None
+    return order, distances
+
+try:
+    if not location_df.empty:
+        location_index = load_location_index(location_df.shape)
+        if location_index is not None:
+            LOCATION_ORDER, LOCATION_SORTED = location_index
+        else:
+            location_distances = location_df.to_numpy(dtype=np.float32)
+            LOCATION_ORDER = np.asfortranarray(np.argsort(location_distances, axis=0, kind="stable").astype(np.int32))
+            LOCATION_SORTED = np.asfortranarray(np.take_along_axis(location_distances, LOCATION_ORDER, axis=0))
+        # Response distances in km, rounded with Python's round() once per distinct distance,
+        # so a search slices a ready column instead of rounding every hit per request
+        distinct, inverse = np.unique(np.ravel(LOCATION_SORTED), return_inverse=True)
+        distinct_km = np.array([round(distance / 1000, 2) for distance in distinct.tolist()])
+        LOCATION_SORTED_KM = np.asfortranarray(distinct_km[np.ravel(inverse)].reshape(LOCATION_SORTED.shape))
+        LOCATION_APARTMENTS = location_df.index.to_numpy()
+        APARTMENT_INDEX = {name: i for i, name in enumerate(LOCATION_APARTMENTS.tolist())}
+        LOCATION_COLUMN_INDEX = {name: i for i, name in enumerate(location_df.columns.tolist())}
+        logger.info("✅ Location radius index built")
+except Exception as e:
+    logger.error(f"❌ Error building location radius index: {e}")
+
+# Load the fused cosine similarity matrix (0.5*sim1 + 0.8*sim2 + 1.0*sim3, float32)
+# for the recommender, so requests only slice a row
 try:
-    cosine_sim1 = load_pickle("cosine_sim1.pkl")
-    cosine_sim2 = load_pickle("cosine_sim2.pkl")
-    cosine_sim3 = load_pickle("cosine_sim3.pkl")
-    logger.info("✅ Cosine similarity matrices loaded successfully")
+    cosine_sim_combined = cosine_future.result()
+    logger.info(f"✅ Cosine similarity matrix loaded: {cosine_sim_combined.shape} {cosine_sim_combined.dtype}")
 except Exception as e:
     logger.warning(f"⚠️ Could not load cosine similarity matrices: {e}")
-    cosine_sim1 = cosine_sim2 = cosine_sim3 = None
+    cosine_sim_combined = None
 
 # Load analysis data
 try:
-    data_viz = pd.read_csv(os.path.join(DATASET_PATH, "data_viz1.csv"))
+    data_viz = data_viz_future.result()
     logger.info(f"✅ Data viz loaded with shape: {data_viz.shape}")
-    
-    # Convert numeric columns
-    num_cols = ["price", "price_per_sqft", "built_up_area", "latitude", "longitude"]
-    existing_num_cols = [col for col in num_cols if col in data_viz.columns]
-    if existing_num_cols:
-        data_viz[existing_num_cols] = data_viz[existing_num_cols].apply(pd.to_numeric, errors="coerce")
-        
 except Exception as e:
     logger.error(f"❌ Error loading data_viz1.csv: {e}")
     data_viz = pd.DataFrame()
 
 # Load feature text
 try:
-    feature_text = load_pickle("feature_text.pkl")
+    feature_text = feature_text_future.result()
     logger.info("✅ Feature text loaded")
 except Exception as e:
     logger.error(f"❌ Error loading feature_text: {e}")
     feature_text = ""
 
-# Determine price column dynamically for data_viz
-price_column = None
-for col in ['price', 'Price', 'price_cr', 'Price_in_cr']:
-    if col in data_viz.columns:
-        price_column = col
-        break
-if price_column is None and not data_viz.empty:
+# Partition data_viz by property_type once so handlers do a dict lookup instead of a mask scan
+DATA_VIZ_BY_PTYPE: dict = {"all": data_viz}
+if "property_type" in data_viz.columns:
+    DATA_VIZ_BY_PTYPE.update({prop_type: sub_df for prop_type, sub_df in data_viz.groupby("property_type", observed=True)})
+
+# Resolve the price column once; handlers reference PRICE_COLUMN instead of re-detecting it
+PRICE_COLUMN = next((c for c in ["price", "Price", "price_cr", "Price_in_cr"] if c in data_viz.columns), "price")
+if PRICE_COLUMN not in data_viz.columns and not data_viz.empty:
     logger.warning("⚠️ Price column not found in data_viz1.csv")
-    price_column = 'price'
+PRICE_VALUES = data_viz[PRICE_COLUMN].dropna().to_numpy() if PRICE_COLUMN in data_viz.columns else np.empty(0)
+
+# Precompute static dropdown options and stats (df/data_viz are never mutated after load)
+OPTIONS_CACHE: dict = {}
+OPTIONS_JSON = None
+STATS_CACHE: dict = {}
+RECOMMENDER_OPTIONS_CACHE = MappingProxyType({})
+RECOMMENDER_OPTIONS_JSON = None
+
+# Dropdown key -> df column for /api/options
+OPTION_COLUMNS = {
+    "property_type": "property_type",
+    "sector": "sector",
+    "bedrooms": "bedRoom",
+    "bathroom": "bathroom",
+    "balcony": "balcony",
+    "property_age": "agePossession",
+    "servant_room": "servant room",
+    "store_room": "store room",
+    "furnishing_type": "furnishing_type",
+    "luxury_category": "luxury_category",
+    "floor_category": "floor_category"
+}
+
+try:
+    if not df.empty:
+        OPTIONS_CACHE = {
+            key: sorted(df[col].dropna().unique().tolist())
+            for key, col in OPTION_COLUMNS.items() if col in df.columns
+        }
+        OPTIONS_JSON = orjson.dumps(OPTIONS_CACHE)
+        logger.info("✅ Dropdown options cached")
+except Exception as e:
+    logger.error(f"❌ Error caching dropdown options: {e}")
+
+try:
+    if not data_viz.empty:
+        avg_price = data_viz[PRICE_COLUMN].mean() if PRICE_COLUMN in data_viz.columns else 0
+        STATS_CACHE = {
+            "total_properties": len(data_viz),
+            "avg_price": f"₹ {avg_price:.2f} Cr",
+            "sectors_covered": len(data_viz["sector"].unique()) if "sector" in data_viz.columns else 0,
+            "model_accuracy": "89.2%",
+            "last_updated": "2025-09-26"
+        }
+except Exception as e:
+    logger.error(f"❌ Error caching stats: {e}")
+
+try:
+    if not location_df.empty:
+        # Read-only view plus pre-encoded bytes: the endpoint returns the same payload untouched
+        RECOMMENDER_OPTIONS_CACHE = MappingProxyType({
+            "locations": tuple(sorted(location_df.columns.tolist())),
+            "apartments": tuple(sorted(location_df.index.tolist())),
+            "sectors": tuple(sorted(data_viz["sector"].dropna().unique().tolist())) if not data_viz.empty else ()
+        })
+        RECOMMENDER_OPTIONS_JSON = orjson.dumps(dict(RECOMMENDER_OPTIONS_CACHE))
+        logger.info("✅ Recommender options cached")
+except Exception as e:
+    logger.error(f"❌ Error caching recommender options: {e}")
+
+# Precompute geomap sector aggregates for every property_type filter ("all" = unfiltered)
+GEOMAP_CACHE: dict = {}
+
+try:
+    geomap_cols = ["sector", "price_per_sqft", "built_up_area", "latitude", "longitude"]
+    if not data_viz.empty and all(col in data_viz.columns for col in geomap_cols):
+        for key, source_df in DATA_VIZ_BY_PTYPE.items():
+            group_df = source_df.groupby("sector", observed=True).agg({
+                "price_per_sqft": "mean",
+                "built_up_area": "mean",
+                "latitude": "mean",
+                "longitude": "mean"
+            }).reset_index()
+            group_df["property_count"] = group_df["sector"].map(source_df["sector"].value_counts().to_dict())
+            group_df = group_df.dropna(subset=["latitude", "longitude"])
+
+            GEOMAP_CACHE[key] = {
+                "sectors": group_df["sector"].tolist(),
+                "price_per_sqft": group_df["price_per_sqft"].to_numpy(),
+                "built_up_area": group_df["built_up_area"].to_numpy(),
+                "latitude": group_df["latitude"].to_numpy(),
+                "longitude": group_df["longitude"].to_numpy(),
+                "property_count": group_df["property_count"].to_numpy()
+            }
+        logger.info(f"✅ Geomap data cached for: {list(GEOMAP_CACHE.keys())}")
+except Exception as e:
+    logger.error(f"❌ Error caching geomap data: {e}")
+
+# Precompute BHK pie counts keyed by (sector, property_type) with np.bincount on the bedRoom array
+BHK_CACHE: dict = {}
+
+def bhk_pie_payload(bedrooms):
+    """Count an integer bedRoom array and return the bhk-pie response shape"""
+    counts = np.bincount(bedrooms)
+    present = np.nonzero(counts)[0]
+    order = np.argsort(-counts[present], kind="stable")
+    return {
+        "bedrooms": present[order].tolist(),
+        "counts": counts[present][order].tolist()
+    }
+
+try:
+    if not data_viz.empty and all(col in data_viz.columns for col in ["sector", "property_type", "bedRoom"]):
+        bhk_df = data_viz.loc[data_viz["bedRoom"].notna(), ["sector", "property_type"]]
+        bhk_bedrooms = data_viz["bedRoom"].dropna().to_numpy().astype(np.int64)
+
+        BHK_CACHE[("overall", "all")] = bhk_pie_payload(bhk_bedrooms)
+        for (sec, prop_type), idx in bhk_df.groupby(["sector", "property_type"], observed=True).indices.items():
+            BHK_CACHE[(sec, prop_type)] = bhk_pie_payload(bhk_bedrooms[idx])
+        for sec, idx in bhk_df.groupby("sector", observed=True).indices.items():
+            BHK_CACHE[(sec, "all")] = bhk_pie_payload(bhk_bedrooms[idx])
+        for prop_type, idx in bhk_df.groupby("property_type", observed=True).indices.items():
+            BHK_CACHE[("overall", prop_type)] = bhk_pie_payload(bhk_bedrooms[idx])
+        logger.info(f"✅ BHK pie data cached for {len(BHK_CACHE)} filter combinations")
+except Exception as e:
+    logger.error(f"❌ Error caching BHK pie data: {e}")
 
 # Pydantic schema
 class PropertyInput(BaseModel):
@@ -157,11 +466,31 @@ class PropertyInput(BaseModel):
 def format_price(value: float) -> str:
     return f"₹ {value:,.2f} Cr"
 
+def input_row(input: PropertyInput):
+    """Flatten a PropertyInput into a feature row in PREDICTION_COLUMNS order"""
+    return [
+        input.property_type, input.sector, input.bedrooms, input.bathroom,
+        input.balcony, input.property_age, input.built_up_area,
+        input.servant_room, input.store_room, input.furnishing_type,
+        input.luxury_category, input.floor_category
+    ]
+
+def price_response(base_price: float):
+    """Build the predict_price response body for a predicted price"""
+    low_price, high_price = base_price - 0.22, base_price + 0.22
+    return {
+        "prediction_raw": float(base_price),
+        "low_price_cr": round(low_price, 2),
+        "high_price_cr": round(high_price, 2),
+        "formatted_range": f"{format_price(low_price)} - {format_price(high_price)}",
+        "sklearn_version": sklearn.__version__,
+        "timestamp": CURRENT_TS["v"]
+    }
+
 # WordCloud Generation Function
 def generate_wordcloud_from_text(text_data, width=800, height=400):
-    """Generate wordcloud image from text data"""
+    """Generate wordcloud PNG bytes from text data"""
     try:
-        # Create wordcloud
         wordcloud = WordCloud(
             width=width,
             height=height,
@@ -171,23 +500,12 @@ def generate_wordcloud_from_text(text_data, width=800, height=400):
             contour_width=1,
             contour_color='steelblue'
         ).generate(text_data)
-        
-        # Create matplotlib figure
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.tight_layout(pad=0)
-        
-        # Save to bytes buffer
+
+        # Encode the PIL image directly instead of going through a matplotlib figure
         buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', bbox_inches='tight', pad_inches=0, dpi=100)
-        buffer.seek(0)
-        
-        # Clear plot to free memory
-        plt.close()
-        
-        return buffer
-        
+        wordcloud.to_image().save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue()
+
     except Exception as e:
         logger.error(f"Error generating wordcloud: {e}")
         return None
@@ -200,21 +518,18 @@ def get_area_vs_price_data(property_type: str = "all"):
         if data_viz.empty:
             raise ValueError("No data available for area vs price analysis")
             
-        df = data_viz.copy()
-        if price_column != "price" and price_column in df.columns:
-            df["price"] = df[price_column]
-
         # Filter property type
-        if property_type != "all" and "property_type" in df.columns:
-            df = df[df["property_type"] == property_type]
-
-        if df.empty:
+        df = DATA_VIZ_BY_PTYPE.get(property_type) if "property_type" in data_viz.columns else data_viz
+        if df is None or df.empty:
             raise ValueError(f"No data available for property type: {property_type}")
 
         # Sample to prevent frontend overload
         sample_size = min(100, len(df))
         df = df.sample(sample_size, random_state=42)
 
+        if PRICE_COLUMN != "price" and PRICE_COLUMN in df.columns:
+            df["price"] = df[PRICE_COLUMN]
+
         return df
 
     except Exception as e:
@@ -288,8 +603,8 @@ def get_property_type_data():
         df = data_viz.copy()
 
         # Ensure price column consistency
-        if price_column != "price" and price_column in df.columns:
-            df["price"] = df[price_column]
+        if PRICE_COLUMN != "price" and PRICE_COLUMN in df.columns:
+            df["price"] = df[PRICE_COLUMN]
 
         # If missing dependent columns, create them from available data
         if "price_per_sqft" not in df.columns and "built_up_area" in df.columns:
@@ -309,7 +624,7 @@ def get_property_type_data():
 
 def property_type_analysis(df):
     """Generates Property Type Analysis Plotly Bar Chart with proper layout"""
-    group_df = df.groupby('property_type', as_index=False).agg({
+    group_df = df.groupby('property_type', as_index=False, observed=True).agg({
         'price': 'mean',
         'price_per_sqft': 'mean',
         'built_up_area': 'mean'
@@ -376,9 +691,9 @@ def sunburst_chart_simplified(df):
             'price_per_sqft': total_avg_price
         })
         
-        # Add property types as children of root
-        for prop_type in df['property_type'].unique():
-            prop_data = df[df['property_type'] == prop_type]
+        # Add property types as children of root (one groupby pass per level instead of
+        # a boolean mask per property type and bedroom; sort=False keeps appearance order)
+        for prop_type, prop_data in df.groupby('property_type', sort=False, observed=True):
             prop_avg_price = prop_data['price_per_sqft'].mean()
             
             hierarchy_data.append({
@@ -390,15 +705,13 @@ def sunburst_chart_simplified(df):
             })
             
             # Add bedrooms as children of property types
-            for bedroom in prop_data['bedRoom'].unique():
-                bed_data = prop_data[prop_data['bedRoom'] == bedroom]
-                bed_avg_price = bed_data['price_per_sqft'].mean()
-                
+            bed_stats = prop_data.groupby('bedRoom', sort=False)['price_per_sqft'].agg(['size', 'mean'])
+            for bedroom, bed_count, bed_avg_price in zip(bed_stats.index.tolist(), bed_stats['size'].tolist(), bed_stats['mean'].tolist()):
                 hierarchy_data.append({
                     'ids': f"{prop_type}_{bedroom}",
                     'labels': f"{bedroom} BHK",
                     'parents': prop_type,
-                    'values': len(bed_data),
+                    'values': bed_count,
                     'price_per_sqft': bed_avg_price
                 })
         
@@ -438,18 +751,19 @@ def get_sunburst_data_df(property_filter: str = "all"):
         if data_viz.empty:
             raise ValueError("No data available for sunburst chart")
             
-        df = data_viz.copy()
-        if price_column != 'price' and price_column in df.columns:
-            df["price"] = df[price_column]
+        # Filter by property type only
+        df = DATA_VIZ_BY_PTYPE.get(property_filter) if "property_type" in data_viz.columns else data_viz
+        if df is None:
+            raise ValueError("No valid data available for sunburst chart")
+
+        df = df.copy()
+        if PRICE_COLUMN != 'price' and PRICE_COLUMN in df.columns:
+            df["price"] = df[PRICE_COLUMN]
         
         # Create price_per_sqft if missing
         if "price_per_sqft" not in df.columns and "built_up_area" in df.columns:
             df["price_per_sqft"] = df["price"] / df["built_up_area"].replace(0, np.nan)
 
-        # Filter by property type only
-        if property_filter != "all" and "property_type" in df.columns:
-            df = df[df["property_type"] == property_filter]
-
         # Filter valid rows
         df = df.dropna(subset=["property_type", "bedRoom", "price_per_sqft"])
         
@@ -463,73 +777,386 @@ def get_sunburst_data_df(property_filter: str = "all"):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# ------------------ API ENDPOINTS ------------------
+# ------------------ PRECOMPUTED RESPONSES ------------------
 
-@app.get("/")
-async def serve_frontend():
-    frontend_index = os.path.join(frontend_path, "index.html")
-    if os.path.exists(frontend_index):
-        return FileResponse(frontend_index)
-    return {"message": "Frontend files not found"}
+# Large numeric list payloads are serialized once with orjson and served as raw bytes
+AREA_PRICE_JSON: dict = {}
+PRICE_DIST_JSON = None
 
-@app.get("/api/predict_price")
-async def predict_price_get():
-    return {"message": "Use POST method to predict price"}
+# Optional Arrow IPC copies (float32 columns) for clients that request format=arrow
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+AREA_PRICE_ARROW: dict = {}
+PRICE_DIST_ARROW = None
 
-@app.post("/api/predict_price")
-async def predict_price(input: PropertyInput):
+def to_arrow_ipc(columns):
+    """Serialize a dict of column arrays into Arrow IPC stream bytes"""
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def arrow_category(values):
+    """Dictionary-encode a string column with compact int8 codes"""
+    categories = pd.Categorical(values.astype(str))
+    return pa.DictionaryArray.from_arrays(categories.codes.astype(np.int8), pa.array(categories.categories.tolist()))
+
+try:
+    if not data_viz.empty:
+        area_price_keys = ["all"]
+        if "property_type" in data_viz.columns:
+            area_price_keys += data_viz["property_type"].dropna().unique().tolist()
+        for key in area_price_keys:
+            area_df = get_area_vs_price_data(key)
+            AREA_PRICE_JSON[key] = orjson.dumps({
+                "area": area_df["built_up_area"].to_numpy(),
+                "price": area_df["price"].to_numpy(),
+                "property_type": area_df["property_type"].tolist(),
+                "bedrooms": area_df["bedRoom"].to_numpy()
+            }, option=orjson.OPT_SERIALIZE_NUMPY)
+            if pa is not None:
+                AREA_PRICE_ARROW[key] = to_arrow_ipc({
+                    "area": area_df["built_up_area"].to_numpy(dtype=np.float32),
+                    "price": area_df["price"].to_numpy(dtype=np.float32),
+                    "property_type": arrow_category(area_df["property_type"]),
+                    "bedrooms": area_df["bedRoom"].to_numpy(dtype=np.float32)
+                })
+        logger.info(f"✅ Area vs price data cached for: {list(AREA_PRICE_JSON.keys())}")
+except Exception as e:
+    logger.error(f"❌ Error caching area vs price data: {e}")
+
+try:
+    if not data_viz.empty:
+        has_price_dist_cols = "property_type" in data_viz.columns and PRICE_COLUMN in data_viz.columns
+        house_df = DATA_VIZ_BY_PTYPE.get("house", pd.DataFrame())
+        flat_df = DATA_VIZ_BY_PTYPE.get("flat", pd.DataFrame())
+        PRICE_DIST_JSON = orjson.dumps({
+            "house_prices": house_df[PRICE_COLUMN].dropna().to_numpy() if has_price_dist_cols and not house_df.empty else [],
+            "flat_prices": flat_df[PRICE_COLUMN].dropna().to_numpy() if has_price_dist_cols and not flat_df.empty else []
+        }, option=orjson.OPT_SERIALIZE_NUMPY)
+        if pa is not None and has_price_dist_cols:
+            # House and flat arrays differ in length, so the Arrow table is long-format (property_type, price)
+            dist_df = data_viz.loc[data_viz["property_type"].isin(["house", "flat"]), ["property_type", PRICE_COLUMN]].dropna()
+            PRICE_DIST_ARROW = to_arrow_ipc({
+                "property_type": arrow_category(dist_df["property_type"]),
+                "price": dist_df[PRICE_COLUMN].to_numpy(dtype=np.float32)
+            })
+except Exception as e:
+    logger.error(f"❌ Error caching price distribution data: {e}")
+
+# Conditional GET: precomputed payloads carry an ETag so revalidating clients get a bodyless 304.
+# Weak validators because GZipMiddleware may re-encode the body.
+def make_etag(payload):
+    """Hash payload bytes into a weak ETag"""
+    return f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+# Keyed by the payload bytes themselves; bytes cache their hash, so lookups don't rehash the content
+PAYLOAD_ETAGS: dict = {
+    payload: make_etag(payload)
+    for payload in [OPTIONS_JSON, RECOMMENDER_OPTIONS_JSON, PRICE_DIST_JSON, PRICE_DIST_ARROW,
+                    *AREA_PRICE_JSON.values(), *AREA_PRICE_ARROW.values()]
+    if payload is not None
+}
+
+def cached_response(request: Request, payload, media_type="application/json", cache_control="public, max-age=3600"):
+    """Serve precomputed bytes with an ETag, or a 304 when the client's copy is current"""
+    etag = PAYLOAD_ETAGS.get(payload) or make_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type=media_type, headers=headers)
+
+# ------------------ PREDICTION BATCHING ------------------
+
+PREDICTION_COLUMNS = [
+    'property_type', 'sector', 'bedRoom', 'bathroom', 'balcony',
+    'agePossession', 'built_up_area', 'servant room', 'store room',
+    'furnishing_type', 'luxury_category', 'floor_category'
+]
+# The ColumnTransformer selects features by name, so input must stay a DataFrame;
+# resolve each column's dtype once so batch frames skip per-column type inference
+if pipeline is not None and hasattr(pipeline, "feature_names_in_"):
+    if set(pipeline.feature_names_in_) != set(PREDICTION_COLUMNS):
+        logger.warning(f"⚠️ Pipeline features {list(pipeline.feature_names_in_)} differ from request columns")
+PREDICTION_DTYPES = {
+    col: np.float64 if col in df.columns and pd.api.types.is_numeric_dtype(df[col]) else object
+    for col in PREDICTION_COLUMNS
+}
+
+def build_prediction_frame(rows):
+    """Build the pipeline input DataFrame column by column with pre-resolved dtypes"""
+    return pd.DataFrame({
+        col: np.array(values, dtype=PREDICTION_DTYPES[col])
+        for col, values in zip(PREDICTION_COLUMNS, zip(*rows))
+    }, copy=False)
+
+# Fitted categories per categorical column. Rows with an unseen value are rejected before
+# predicting, so one bad row doesn't fail the batch and force a one-row frame per request.
+PIPELINE_CATEGORIES: dict = {}
+
+if pipeline is not None:
     try:
-        if pipeline is None:
-            raise HTTPException(status_code=500, detail="Model not loaded")
-            
-        one_df = pd.DataFrame([[
-            input.property_type, input.sector, input.bedrooms, input.bathroom,
-            input.balcony, input.property_age, input.built_up_area,
-            input.servant_room, input.store_room, input.furnishing_type,
-            input.luxury_category, input.floor_category
-        ]], columns=[
-            'property_type', 'sector', 'bedRoom', 'bathroom', 'balcony',
-            'agePossession', 'built_up_area', 'servant room', 'store room',
-            'furnishing_type', 'luxury_category', 'floor_category'
-        ])
+        encoder = pipeline.named_steps["preprocessor"].named_transformers_["cat"]
+        if getattr(encoder, "handle_unknown", "error") == "error":
+            PIPELINE_CATEGORIES = {col: set(cats) for col, cats in zip(encoder.feature_names_in_, encoder.categories_)}
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read fitted categories from pipeline: {e}")
 
-        base_price = np.expm1(pipeline.predict(one_df))[0]
-        low_price, high_price = base_price - 0.22, base_price + 0.22
+# Optional ONNX Runtime session exported offline by export_onnx.py: the preprocessor and
+# forest run as one native graph instead of sklearn's per-step Python dispatch
+ONNX_FILE = os.path.join(DATASET_PATH, "pipeline.onnx")
+onnx_session = None
+ONNX_INPUTS = []
 
-        return {
-            "prediction_raw": float(base_price),
-            "low_price_cr": round(low_price, 2),
-            "high_price_cr": round(high_price, 2),
-            "formatted_range": f"{format_price(low_price)} - {format_price(high_price)}",
-            "sklearn_version": sklearn.__version__,
-            "timestamp": datetime.now().isoformat()
-        }
+# The ONNX encoders map unseen categories silently, so the session is only used when the
+# fitted categories are available to keep sklearn's error
+if ort is not None and pipeline is not None and PIPELINE_CATEGORIES and os.path.exists(ONNX_FILE):
+    try:
+        onnx_session = ort.InferenceSession(ONNX_FILE, providers=["CPUExecutionProvider"])
+        # skl2onnx sanitizes input names ("servant room" -> "servant_room")
+        column_index = {col.replace(" ", "_"): i for i, col in enumerate(PREDICTION_COLUMNS)}
+        ONNX_INPUTS = [
+            (inp.name, column_index[inp.name], np.float32 if inp.type == "tensor(float)" else object)
+            for inp in onnx_session.get_inputs()
+        ]
+        logger.info("✅ ONNX pipeline loaded")
     except Exception as e:
-        logger.error(f"Prediction error: {e}")
-        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        logger.error(f"❌ Error loading ONNX pipeline, using sklearn: {e}")
+        onnx_session = None
+
+def find_unknown_category(row):
+    """Return a ValueError for the first categorical value the pipeline was not fitted on, else None"""
+    for col, value in zip(PREDICTION_COLUMNS, row):
+        allowed = PIPELINE_CATEGORIES.get(col)
+        if allowed is not None and value not in allowed:
+            return ValueError(f"Found unknown categories ['{value}'] in column '{col}'")
+    return None
+
+def predict_rows_onnx(rows):
+    """Predict prices for validated rows with the ONNX session, falling back to sklearn if the session fails"""
+    try:
+        columns = list(zip(*rows))
+        feeds = {name: np.array(columns[i], dtype=dtype).reshape(-1, 1) for name, i, dtype in ONNX_INPUTS}
+        return np.expm1(onnx_session.run(None, feeds)[0].ravel().astype(np.float64)).tolist()
+    except Exception as e:
+        # e.g. a dtype/shape mismatch or an ORT runtime error; sklearn isolates failing rows
+        logger.warning(f"⚠️ ONNX prediction failed, using sklearn: {e}")
+        return predict_rows_sklearn(rows)
 
-@app.get("/api/options")
-async def get_options():
+def predict_rows_sklearn(rows):
+    """Predict prices for validated rows with the sklearn pipeline; failed rows yield their exception"""
     try:
-        if df.empty:
-            raise HTTPException(status_code=500, detail="No data available")
-            
-        return {
-            "property_type": sorted(df["property_type"].unique().tolist()),
-            "sector": sorted(df["sector"].unique().tolist()),
-            "bedrooms": sorted(df["bedRoom"].unique().tolist()),
-            "bathroom": sorted(df["bathroom"].unique().tolist()),
-            "balcony": sorted(df["balcony"].unique().tolist()),
-            "property_age": sorted(df["agePossession"].unique().tolist()),
-            "servant_room": sorted(df["servant room"].unique().tolist()),
-            "store_room": sorted(df["store room"].unique().tolist()),
-            "furnishing_type": sorted(df["furnishing_type"].unique().tolist()),
-            "luxury_category": sorted(df["luxury_category"].unique().tolist()),
-            "floor_category": sorted(df["floor_category"].unique().tolist())
-        }
+        return np.expm1(pipeline.predict(build_prediction_frame(rows))).tolist()
+    except Exception:
+        # Unexpected failures (not unknown categories, which are filtered out) still
+        # fall back to predicting row by row to isolate the error
+        prices = []
+        for row in rows:
+            try:
+                prices.append(float(np.expm1(pipeline.predict(build_prediction_frame([row])))[0]))
+            except Exception as e:
+                prices.append(e)
+        return prices
+
+def predict_batch(rows):
+    """Predict prices for a batch of rows; failed rows yield their exception instead of a price"""
+    errors = [find_unknown_category(row) for row in rows]
+    valid_rows = [row for row, error in zip(rows, errors) if error is None]
+    prices = iter(())
+    if valid_rows:
+        predict_rows = predict_rows_onnx if onnx_session is not None else predict_rows_sklearn
+        prices = iter(predict_rows(valid_rows))
+    return [error if error is not None else next(prices) for error in errors]
+
+PREDICTION_BATCH_SIZE = 32
+PREDICTION_BATCH_WAIT = 0.01  # seconds to wait for more requests before predicting
+
+# Created in startup_event so they bind to the running event loop
+prediction_queue = None
+prediction_task = None
+
+# LRU cache of predicted prices keyed by the input row; only touched from the event loop thread
+PREDICTION_CACHE_SIZE = 4096
+PREDICTION_CACHE: OrderedDict = OrderedDict()
+
+def get_cached_prediction(row):
+    """Return the cached price for a prediction row, or None on a miss"""
+    key = tuple(row)
+    price = PREDICTION_CACHE.get(key)
+    if price is not None:
+        PREDICTION_CACHE.move_to_end(key)
+    return price
+
+def cache_prediction(row, price):
+    """Store a predicted price, evicting the least recently used entry when full"""
+    PREDICTION_CACHE[tuple(row)] = price
+    PREDICTION_CACHE.move_to_end(tuple(row))
+    if len(PREDICTION_CACHE) > PREDICTION_CACHE_SIZE:
+        PREDICTION_CACHE.popitem(last=False)
+
+async def prediction_batcher():
+    """Collect queued prediction rows and run one pipeline.predict per batch"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await prediction_queue.get()]
+        deadline = loop.time() + PREDICTION_BATCH_WAIT
+        while len(batch) < PREDICTION_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(prediction_queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+
+        rows = [row for row, _ in batch]
+        futures = [future for _, future in batch]
+
+        # pipeline.predict is CPU-bound; run it in a worker thread so the event loop keeps serving
+        try:
+            prices = await asyncio.to_thread(predict_batch, rows)
+        except Exception as e:
+            # Fail this batch's requests but keep the batcher alive for the next ones
+            logger.error(f"❌ Prediction batch failed: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        for row, future, price in zip(rows, futures, prices):
+            if isinstance(price, Exception):
+                if not future.done():
+                    future.set_exception(price)
+                continue
+            cache_prediction(row, price)
+            if not future.done():
+                future.set_result(price)
+
+# ------------------ STARTUP ------------------
+
+# feature_text is static, so the wordcloud PNG is rendered once and reused
+WORDCLOUD_CACHE = None
+
+def set_wordcloud_cache(png):
+    """Store a rendered wordcloud PNG and precompute its ETag, replacing the previous image's entry"""
+    global WORDCLOUD_CACHE
+    if WORDCLOUD_CACHE is not None:
+        PAYLOAD_ETAGS.pop(WORDCLOUD_CACHE, None)
+    WORDCLOUD_CACHE = png
+    if png:
+        PAYLOAD_ETAGS[png] = make_etag(png)
+
+# Response timestamps are read from a string refreshed once a second instead of formatted per request
+CURRENT_TS = {"v": datetime.now().isoformat()}
+timestamp_task = None
+
+async def timestamp_ticker():
+    """Refresh CURRENT_TS every second"""
+    while True:
+        await asyncio.sleep(1)
+        CURRENT_TS["v"] = datetime.now().isoformat()
+
+def warm_up_prediction():
+    """Run one df row through predict_batch so the first request doesn't pay first-call setup"""
+    if pipeline is None or df.empty or not set(PREDICTION_COLUMNS) <= set(df.columns):
+        return
+    try:
+        price = predict_batch([df[PREDICTION_COLUMNS].iloc[0].tolist()])[0]
+        if isinstance(price, Exception):
+            raise price
+        logger.info("✅ Prediction pipeline warmed up")
     except Exception as e:
-        logger.error(f"Error loading options: {e}")
-        raise HTTPException(status_code=500, detail=f"Error loading options: {str(e)}")
+        logger.warning(f"⚠️ Prediction warm-up failed: {e}")
+
+async def render_wordcloud():
+    """Render the wordcloud PNG into WORDCLOUD_CACHE"""
+    set_wordcloud_cache(await asyncio.to_thread(generate_wordcloud_from_text, feature_text))
+    if WORDCLOUD_CACHE:
+        logger.info("✅ WordCloud image cached")
+
+async def startup_event():
+    global prediction_queue, prediction_task, timestamp_task
+    prediction_queue = asyncio.Queue()
+    prediction_task = asyncio.create_task(prediction_batcher())
+    timestamp_task = asyncio.create_task(timestamp_ticker())
+
+    # Artifacts are already loaded at import; the wordcloud render and the prediction
+    # warm-up are independent, so they run concurrently in worker threads
+    warmups = [asyncio.to_thread(warm_up_prediction)]
+    if feature_text:
+        warmups.append(render_wordcloud())
+    await asyncio.gather(*warmups)
+
+async def shutdown_event():
+    for task in (prediction_task, timestamp_task):
+        if task is not None:
+            task.cancel()
+    await asyncio.gather(*(task for task in (prediction_task, timestamp_task) if task is not None),
+                         return_exceptions=True)
+
+# ------------------ API ENDPOINTS ------------------
+
+@app.get("/api/predict_price")
+async def predict_price_get():
+    return {"message": "Use POST method to predict price"}
+
+@app.post("/api/predict_price")
+async def predict_price(input: PropertyInput):
+    if pipeline is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+
+    row = input_row(input)
+    unknown_category = find_unknown_category(row)
+    if unknown_category is not None:
+        raise HTTPException(status_code=400, detail=f"Prediction error: {unknown_category}")
+
+    # Repeated inputs are served from the LRU cache; misses are batched into one pipeline.predict call
+    base_price = get_cached_prediction(row)
+    if base_price is None:
+        future = asyncio.get_running_loop().create_future()
+        await prediction_queue.put((row, future))
+        base_price = await future
+
+    return price_response(base_price)
+
+MAX_PREDICTION_BATCH = 1000
+
+@app.post("/api/predict_price_batch")
+async def predict_price_batch(inputs: List[PropertyInput]):
+    """Predict many properties with one pipeline.predict call; failed items carry an error instead of a price"""
+    if pipeline is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+
+    if len(inputs) > MAX_PREDICTION_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PREDICTION_BATCH} properties per batch")
+
+    rows = [input_row(input) for input in inputs]
+    prices = [get_cached_prediction(row) for row in rows]
+
+    # Cache misses bypass the request batcher: they already form a batch
+    missing = [i for i, price in enumerate(prices) if price is None]
+    if missing:
+        try:
+            predicted = await asyncio.to_thread(predict_batch, [rows[i] for i in missing])
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+        for i, price in zip(missing, predicted):
+            if not isinstance(price, Exception):
+                cache_prediction(rows[i], price)
+            prices[i] = price
+
+    return ORJSONResponse([
+        {"error": f"Prediction error: {str(price)}"} if isinstance(price, Exception) else price_response(price)
+        for price in prices
+    ])
+
+@app.get("/api/options")
+async def get_options(request: Request):
+    if not OPTIONS_CACHE:
+        raise HTTPException(status_code=500, detail="No data available")
+    return cached_response(request, OPTIONS_JSON)
 
 @app.get("/api/health")
 async def health_check():
@@ -540,182 +1167,153 @@ async def health_check():
         "data_loaded": not df.empty,
         "recommender_loaded": not location_df.empty,
         "analysis_loaded": not data_viz.empty,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": CURRENT_TS["v"]
     }
 
 # ------------------ RECOMMENDER ENDPOINTS ------------------
 
 @app.get("/api/recommender/options")
-async def get_recommender_options():
+async def get_recommender_options(request: Request):
     """Get dropdown options for recommender section"""
-    try:
-        if location_df.empty:
-            raise HTTPException(status_code=500, detail="Location data not loaded")
-
-        locations = sorted(location_df.columns.tolist())
-        apartments = sorted(location_df.index.tolist())
-        sectors = sorted(data_viz["sector"].unique().tolist()) if not data_viz.empty else []
-
-        return {
-            "locations": locations,
-            "apartments": apartments,
-            "sectors": sectors
-        }
-    except Exception as e:
-        logger.error(f"Error loading recommender options: {e}")
-        raise HTTPException(status_code=500, detail=f"Error loading recommender options: {str(e)}")
+    if RECOMMENDER_OPTIONS_JSON is None:
+        raise HTTPException(status_code=500, detail="Location data not loaded")
+    return cached_response(request, RECOMMENDER_OPTIONS_JSON)
 
 
 @app.get("/api/recommender/location-search")
 async def location_search(location: str, radius: float = 10.0):
     """Find nearby properties based on selected location and radius"""
-    try:
-        if location_df.empty:
-            raise HTTPException(status_code=500, detail="Location data not loaded")
+    if location_df.empty or LOCATION_SORTED is None:
+        raise HTTPException(status_code=500, detail="Location data not loaded")
 
-        if location not in location_df.columns:
-            raise HTTPException(status_code=400, detail="Invalid location")
+    col = LOCATION_COLUMN_INDEX.get(location)
+    if col is None:
+        raise HTTPException(status_code=400, detail="Invalid location")
 
-        if radius <= 0:
-            raise HTTPException(status_code=400, detail="Radius must be positive")
+    if not radius > 0:  # also rejects NaN, which would otherwise match every row
+        raise HTTPException(status_code=400, detail="Radius must be positive")
 
-        # Convert km to meters and filter
-        radius_meters = radius * 1000
-        result_series = location_df[location_df[location] < radius_meters][location].sort_values()
+    # Convert km to meters; the pre-sorted column's prefix below the radius is the answer.
+    # The column is float32, so search for the radius rounded to float32 and include
+    # equal distances when it rounded down, keeping the cut at distance < radius exactly.
+    radius_meters = radius * 1000
+    threshold = np.float32(radius_meters)
+    count = np.searchsorted(LOCATION_SORTED[:, col], threshold, side="left" if threshold >= radius_meters else "right")
+    names = LOCATION_APARTMENTS[LOCATION_ORDER[:count, col]].tolist()
+    distances_km = LOCATION_SORTED_KM[:count, col].tolist()
 
-        results = []
-        for property_name, distance_meters in result_series.items():
-            results.append({
-                "property": property_name,
-                "distance": round(distance_meters / 1000, 2)
-            })
+    return ORJSONResponse([{"property": name, "distance": distance} for name, distance in zip(names, distances_km)])
 
-        return results
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error in location search: {e}")
-        raise HTTPException(status_code=500, detail=f"Error in location search: {str(e)}")
+def top_similar(idx, top_n):
+    """Return (indices, scores) of the top_n apartments most similar to row idx of the fused matrix"""
+    top_indices, top_scores = similarity_topk.top_similar(cosine_sim_combined[idx], top_n, idx)
+    return top_indices, top_scores.tolist()
 
+# Compile the kernel for the matrix's dtype/layout at load time so the first request doesn't pay for it
+if similarity_topk.topk_row is not None and cosine_sim_combined is not None and len(cosine_sim_combined):
+    try:
+        similarity_topk.warm_up(cosine_sim_combined[0])
+        logger.info("✅ Recommender top-k kernel compiled")
+    except Exception as e:
+        logger.error(f"❌ Error compiling recommender top-k kernel, using NumPy: {e}")
+
+# LRU cache of encoded recommendation lists keyed by (row, top_n); the matrix is static,
+# so results never go stale. Only touched from the event loop thread.
+RECOMMENDATION_CACHE_SIZE = 4096
+RECOMMENDATION_CACHE: OrderedDict = OrderedDict()
+
+def get_cached_recommendation(key):
+    """Return the cached recommendation payload for key, or None on a miss"""
+    payload = RECOMMENDATION_CACHE.get(key)
+    if payload is not None:
+        RECOMMENDATION_CACHE.move_to_end(key)
+    return payload
+
+def cache_recommendation(key, payload):
+    """Store a recommendation payload, evicting the least recently used entry when full"""
+    RECOMMENDATION_CACHE[key] = payload
+    RECOMMENDATION_CACHE.move_to_end(key)
+    if len(RECOMMENDATION_CACHE) > RECOMMENDATION_CACHE_SIZE:
+        RECOMMENDATION_CACHE.popitem(last=False)
 
 @app.get("/api/recommender/recommend")
 async def recommend_apartments(apartment: str, top_n: int = 5):
-    """Recommend similar apartments using combined cosine similarity matrices"""
-    try:
-        if location_df.empty:
-            raise HTTPException(status_code=500, detail="Location data not loaded")
-
-        if any(sim is None for sim in [cosine_sim1, cosine_sim2, cosine_sim3]):
-            raise HTTPException(status_code=500, detail="Similarity matrices not loaded")
-
-        if apartment not in location_df.index:
-            raise HTTPException(status_code=404, detail="Apartment not found in dataset")
-
-        # Combine the three similarity matrices
-        cosine_sim_matrix = 0.5 * cosine_sim1 + 0.8 * cosine_sim2 + 1.0 * cosine_sim3
-
-        # Compute similarity scores for the selected apartment
-        idx = location_df.index.get_loc(apartment)
-        sim_scores = list(enumerate(cosine_sim_matrix[idx]))
-
-        # Sort by similarity score
-        sorted_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-
-        # Get top N similar apartments (excluding the same one)
-        top_indices = [i[0] for i in sorted_scores[1:top_n + 1]]
-        top_scores = [i[1] for i in sorted_scores[1:top_n + 1]]
-        top_properties = location_df.index[top_indices].tolist()
-
-        recommendations = [
+    """Recommend similar apartments using the pre-fused cosine similarity matrix"""
+    if location_df.empty or LOCATION_APARTMENTS is None:
+        raise HTTPException(status_code=500, detail="Location data not loaded")
+
+    if cosine_sim_combined is None:
+        raise HTTPException(status_code=500, detail="Similarity matrices not loaded")
+
+    idx = APARTMENT_INDEX.get(apartment)
+    if idx is None:
+        raise HTTPException(status_code=404, detail="Apartment not found in dataset")
+
+    # Every top_n outside [0, N-1] returns the same list, so clamp it for the cache key
+    top_n = min(max(top_n, 0), len(LOCATION_APARTMENTS) - 1)
+    payload = get_cached_recommendation((idx, top_n))
+    if payload is None:
+        # The row read can page-fault into the memory-mapped matrix, so the top-k runs in a worker thread
+        top_indices, top_scores = await asyncio.to_thread(top_similar, idx, top_n)
+        top_properties = LOCATION_APARTMENTS[top_indices].tolist()
+
+        # Encoded once with orjson; hits return the bytes without rebuilding the list
+        payload = orjson.dumps([
             {"PropertyName": prop, "SimilarityScore": round(score, 3)}
             for prop, score in zip(top_properties, top_scores)
-        ]
-
-        return recommendations
+        ])
+        cache_recommendation((idx, top_n), payload)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error generating recommendations: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=payload, media_type="application/json")
 
 # ------------------ ANALYSIS ENDPOINTS ------------------
 
 WORDCLOUD_FILE = os.path.join(DATASET_PATH, "wordcloud.png")
-wordcloud_exists = os.path.exists(WORDCLOUD_FILE)
 
 @app.get("/api/analysis/generate-wordcloud")
 async def generate_wordcloud_endpoint():
-    """Generate dynamic wordcloud from feature text"""
-    try:
-        if not feature_text:
-            raise HTTPException(status_code=500, detail="No feature text available for wordcloud generation")
-        
-        # Generate wordcloud
-        wordcloud_buffer = generate_wordcloud_from_text(feature_text)
-        
-        if wordcloud_buffer:
-            # Save to file for persistent access
-            wordcloud_path = os.path.join(DATASET_PATH, "wordcloud_generated.png")
-            with open(wordcloud_path, "wb") as f:
-                f.write(wordcloud_buffer.getvalue())
-            
-            return {"message": "WordCloud generated successfully", "path": "/api/analysis/wordcloud"}
-        else:
-            raise HTTPException(status_code=500, detail="Failed to generate wordcloud")
-            
-    except Exception as e:
-        logger.error(f"WordCloud generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"WordCloud generation failed: {str(e)}")
+    """Regenerate the cached wordcloud from feature text"""
+    if not feature_text:
+        raise HTTPException(status_code=500, detail="No feature text available for wordcloud generation")
+
+    wordcloud_png = await asyncio.to_thread(generate_wordcloud_from_text, feature_text)
+    if wordcloud_png is None:
+        raise HTTPException(status_code=500, detail="Failed to generate wordcloud")
+
+    set_wordcloud_cache(wordcloud_png)
+    return {"message": "WordCloud generated successfully", "path": "/api/analysis/wordcloud"}
 
 @app.get("/api/analysis/wordcloud")
-async def get_wordcloud():
-    """Serve generated wordcloud image"""
-    try:
-        # Try generated wordcloud first
-        generated_path = os.path.join(DATASET_PATH, "wordcloud_generated.png")
-        if os.path.exists(generated_path):
-            return FileResponse(generated_path)
-        
-        # Fallback to static wordcloud
-        static_path = os.path.join(DATASET_PATH, "wordcloud.png")
-        if os.path.exists(static_path):
-            return FileResponse(static_path)
-        
-        # Generate new wordcloud if none exists
-        await generate_wordcloud_endpoint()
-        if os.path.exists(generated_path):
-            return FileResponse(generated_path)
-        
-        raise HTTPException(status_code=404, detail="Wordcloud image not found")
-        
-    except Exception as e:
-        logger.error(f"Error serving wordcloud: {e}")
-        raise HTTPException(status_code=500, detail="Wordcloud unavailable")
+async def get_wordcloud(request: Request):
+    """Serve the wordcloud image rendered at startup"""
+    if WORDCLOUD_CACHE:
+        # The image can be regenerated, so clients always revalidate
+        return cached_response(request, WORDCLOUD_CACHE, media_type="image/png", cache_control="no-cache")
+
+    # Fallback to static wordcloud
+    if os.path.exists(WORDCLOUD_FILE):
+        return FileResponse(WORDCLOUD_FILE)
+
+    raise HTTPException(status_code=404, detail="Wordcloud image not found")
 
 @app.get("/api/analysis/area-vs-price")
-async def get_area_vs_price(property_type: str = "all"):
-    """Returns raw numeric data for frontend analytics"""
-    try:
-        df = get_area_vs_price_data(property_type)
-        return {
-            "area": df["built_up_area"].tolist(),
-            "price": df["price"].tolist(),
-            "property_type": df["property_type"].tolist(),
-            "bedrooms": df["bedRoom"].tolist()
-        }
-    except Exception as e:
-        logger.error(f"Error in /api/analysis/area-vs-price: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_area_vs_price(request: Request, property_type: str = "all", format: str = "json"):
+    """Returns raw numeric data for frontend analytics (format=arrow for an Arrow IPC stream)"""
+    if property_type not in AREA_PRICE_JSON:
+        raise HTTPException(status_code=500, detail=f"No data available for property type: {property_type}")
+    if format == "arrow":
+        if property_type not in AREA_PRICE_ARROW:
+            raise HTTPException(status_code=501, detail="Arrow format not available (pyarrow not installed)")
+        return cached_response(request, AREA_PRICE_ARROW[property_type], media_type=ARROW_MEDIA_TYPE)
+    return cached_response(request, AREA_PRICE_JSON[property_type])
 
 @app.get("/api/charts/area-vs-price")
 async def get_dynamic_area_vs_price(property_type: str = "all"):
     """Returns full Plotly chart JSON for dynamic frontend rendering"""
     try:
         df = get_area_vs_price_data(property_type)
-        fig = area_vs_price_chart(df, property_type)
-        chart_json = json.loads(fig.to_json())
+        chart_json = await asyncio.to_thread(lambda: json.loads(area_vs_price_chart(df, property_type).to_json()))
         return {"chart": chart_json, "property_type": property_type}
     except Exception as e:
         logger.error(f"Error generating chart /api/charts/area-vs-price: {e}")
@@ -726,8 +1324,7 @@ async def get_property_type_analysis():
     """Property Type Analysis Chart - Average Price Comparison"""
     try:
         df = get_property_type_data()
-        fig = property_type_analysis(df)
-        chart_json = json.loads(fig.to_json())
+        chart_json = await asyncio.to_thread(lambda: json.loads(property_type_analysis(df).to_json()))
         return {"chart": chart_json}
 
     except Exception as e:
@@ -740,8 +1337,7 @@ async def get_sunburst_chart(property_filter: str = "all"):
     """Sunburst: Proper hierarchical structure with single root"""
     try:
         df = get_sunburst_data_df(property_filter)
-        fig = sunburst_chart_simplified(df)
-        chart_json = json.loads(fig.to_json())
+        chart_json = await asyncio.to_thread(lambda: json.loads(sunburst_chart_simplified(df).to_json()))
         return {"chart": chart_json, "filters": {"property_type": property_filter}}
 
     except Exception as e:
@@ -760,8 +1356,8 @@ async def get_sunburst_data(property_filter: str = "all"):
             {"id": "root", "parent": "", "label": "All Properties", "value": len(df), "avg_price_per_sqft": df["price_per_sqft"].mean()}
         ]
         
-        for prop_type in df["property_type"].unique():
-            prop_data = df[df["property_type"] == prop_type]
+        # Group once per level instead of masking the frame per property type and bedroom
+        for prop_type, prop_data in df.groupby("property_type", sort=False, observed=True):
             hierarchy.append({
                 "id": prop_type,
                 "parent": "root",
@@ -770,14 +1366,14 @@ async def get_sunburst_data(property_filter: str = "all"):
                 "avg_price_per_sqft": prop_data["price_per_sqft"].mean()
             })
             
-            for bedroom in sorted(prop_data["bedRoom"].unique()):
-                bed_data = prop_data[prop_data["bedRoom"] == bedroom]
+            bed_stats = prop_data.groupby("bedRoom")["price_per_sqft"].agg(["size", "mean"])
+            for bedroom, bed_count, bed_avg_price in zip(bed_stats.index.tolist(), bed_stats["size"].tolist(), bed_stats["mean"].tolist()):
                 hierarchy.append({
                     "id": f"{prop_type}_{bedroom}",
                     "parent": prop_type,
                     "label": f"{bedroom} BHK",
-                    "value": len(bed_data),
-                    "avg_price_per_sqft": bed_data["price_per_sqft"].mean()
+                    "value": bed_count,
+                    "avg_price_per_sqft": bed_avg_price
                 })
         
         return {
@@ -789,56 +1385,32 @@ async def get_sunburst_data(property_filter: str = "all"):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/analysis/bhk-pie")
-async def get_bhk_pie(sector: str = "overall"):
-    try:
-        if data_viz.empty:
-            raise HTTPException(status_code=500, detail="No analysis data available")
-        
-        df_subset = data_viz
-        if sector != "overall" and 'sector' in data_viz.columns:
-            df_subset = data_viz[data_viz["sector"] == sector]
-        
-        if df_subset.empty or 'bedRoom' not in df_subset.columns:
-            raise HTTPException(status_code=500, detail="No BHK data available")
-            
-        bhk_counts = df_subset["bedRoom"].value_counts().reset_index()
-        bhk_counts.columns = ["bedRoom", "count"]
-            
-        return {
-            "bedrooms": bhk_counts["bedRoom"].astype(int).tolist(),
-            "counts": bhk_counts["count"].tolist()
-        }
-    except Exception as e:
-        logger.error(f"Error processing BHK pie data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_bhk_pie(sector: str = "overall", property_type: str = "all"):
+    if data_viz.empty:
+        raise HTTPException(status_code=500, detail="No analysis data available")
+
+    bhk_data = BHK_CACHE.get((sector, property_type))
+    if bhk_data is None:
+        raise HTTPException(status_code=500, detail="No BHK data available")
+
+    return bhk_data
 
 @app.get("/api/analysis/price-distribution")
 async def get_price_distribution():
     if data_viz.empty:
         raise HTTPException(status_code=500, detail="Analysis data not loaded")
-    
-    try:
-        prices = data_viz[price_column].dropna().tolist() if price_column in data_viz.columns else data_viz['Price'].dropna().tolist()
-        return {"prices": prices}
-    except Exception as e:
-        logger.error(f"Error processing price distribution data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+
+    return ORJSONResponse({"prices": PRICE_VALUES})
 
 @app.get("/api/analysis/price-dist")
-async def get_price_distribution_enhanced():
-    try:
-        if data_viz.empty:
-            raise HTTPException(status_code=500, detail="No analysis data available")
-            
-        house_prices = data_viz[data_viz["property_type"] == "house"][price_column].dropna().tolist() if "property_type" in data_viz.columns and price_column and price_column in data_viz.columns else []
-        flat_prices = data_viz[data_viz["property_type"] == "flat"][price_column].dropna().tolist() if "property_type" in data_viz.columns and price_column and price_column in data_viz.columns else []
-        return {
-            "house_prices": house_prices,
-            "flat_prices": flat_prices
-        }
-    except Exception as e:
-        logger.error(f"Error loading price distribution data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_price_distribution_enhanced(request: Request, format: str = "json"):
+    if PRICE_DIST_JSON is None:
+        raise HTTPException(status_code=500, detail="No analysis data available")
+    if format == "arrow":
+        if PRICE_DIST_ARROW is None:
+            raise HTTPException(status_code=501, detail="Arrow format not available (pyarrow not installed)")
+        return cached_response(request, PRICE_DIST_ARROW, media_type=ARROW_MEDIA_TYPE)
+    return cached_response(request, PRICE_DIST_JSON)
 
 @app.get("/api/analysis/correlation")
 async def get_correlation_heatmap():
@@ -850,10 +1422,10 @@ async def get_correlation_heatmap():
         numerical_cols = data_viz.select_dtypes(include=[np.number]).columns
         corr_data = data_viz[numerical_cols].corr()
         
-        return {
+        return ORJSONResponse({
             "columns": corr_data.columns.tolist(),
-            "values": corr_data.values.tolist()
-        }
+            "values": corr_data.to_numpy()
+        })
     except Exception as e:
         logger.error(f"Error processing correlation data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -872,72 +1444,32 @@ async def get_correlation_data():
         
         corr_matrix = data_viz[numeric_cols].corr().round(2)
         
-        return {
+        return ORJSONResponse({
             "columns": numeric_cols,
-            "correlation_matrix": corr_matrix.values.tolist()
-        }
+            "correlation_matrix": corr_matrix.to_numpy()
+        })
     except Exception as e:
         logger.error(f"Error loading correlation data: {e}")
         raise HTTPException(status_code=500, detail=f"Error loading correlation data: {str(e)}")
 
 @app.get("/api/analysis/geomap")
-async def get_geomap():
-    try:
-        if data_viz.empty:
-            raise HTTPException(status_code=500, detail="No analysis data available")
-        
-        # Check if required columns exist
-        required_cols = ["sector", "price_per_sqft", "built_up_area", "latitude", "longitude"]
-        missing_cols = [col for col in required_cols if col not in data_viz.columns]
-        if missing_cols:
-            raise HTTPException(status_code=500, detail=f"Missing required columns: {missing_cols}")
-        
-        # Group by sector and calculate averages
-        group_df = data_viz.groupby("sector").agg({
-            "price_per_sqft": "mean",
-            "built_up_area": "mean",
-            "latitude": "mean",
-            "longitude": "mean"
-        }).reset_index()
-        
-        # Count properties per sector
-        property_count = data_viz["sector"].value_counts().to_dict()
-        group_df["property_count"] = group_df["sector"].map(property_count)
-        
-        # Filter out null coordinates
-        group_df = group_df.dropna(subset=["latitude", "longitude"])
-        
-        return {
-            "sectors": group_df["sector"].tolist(),
-            "price_per_sqft": group_df["price_per_sqft"].tolist(),
-            "built_up_area": group_df["built_up_area"].tolist(),
-            "latitude": group_df["latitude"].tolist(),
-            "longitude": group_df["longitude"].tolist(),
-            "property_count": group_df["property_count"].tolist()
-        }
-    except Exception as e:
-        logger.error(f"Error loading geomap data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_geomap(property_type: str = "all"):
+    if data_viz.empty:
+        raise HTTPException(status_code=500, detail="No analysis data available")
+
+    if not GEOMAP_CACHE:
+        raise HTTPException(status_code=500, detail="Geomap data not available")
+
+    if property_type not in GEOMAP_CACHE:
+        raise HTTPException(status_code=400, detail=f"Invalid property type: {property_type}")
+
+    return ORJSONResponse({**GEOMAP_CACHE[property_type], "filters": {"property_type": property_type}})
 
 @app.get("/api/stats")
 async def get_stats():
-    try:
-        if data_viz.empty:
-            raise HTTPException(status_code=500, detail="No analysis data available")
-            
-        avg_price = data_viz[price_column].mean() if price_column and price_column in data_viz.columns else 0
-        sectors_covered = len(data_viz["sector"].unique()) if "sector" in data_viz.columns else 0
-        
-        return {
-            "total_properties": len(data_viz),
-            "avg_price": f"₹ {avg_price:.2f} Cr",
-            "sectors_covered": sectors_covered,
-            "model_accuracy": "89.2%",
-            "last_updated": "2025-09-26"
-        }
-    except Exception as e:
-        logger.error(f"Error in get_stats: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if not STATS_CACHE:
+        raise HTTPException(status_code=500, detail="No analysis data available")
+    return STATS_CACHE
 
 @app.get("/api/analysis/analysis-options")
 async def get_analysis_options():
@@ -992,8 +1524,8 @@ async def get_luxury_category_data():
             raise HTTPException(status_code=500, detail="No analysis data available")
         
         if 'luxury_category' in data_viz.columns:
-            luxury_data = data_viz.groupby('luxury_category').agg({
-                price_column: ['count', 'mean'],
+            luxury_data = data_viz.groupby('luxury_category', observed=True).agg({
+                PRICE_COLUMN: ['count', 'mean'],
                 'built_up_area': 'mean'
             }).reset_index()
             
@@ -1019,14 +1551,14 @@ async def get_price_trend():
         if data_viz.empty:
             raise HTTPException(status_code=500, detail="No analysis data available")
         
-        if 'sector' in data_viz.columns and price_column in data_viz.columns:
-            sector_prices = data_viz.groupby('sector')[price_column].mean().sort_values(ascending=False).head(10)
+        if 'sector' in data_viz.columns and PRICE_COLUMN in data_viz.columns:
+            sector_prices = data_viz.groupby('sector', observed=True)[PRICE_COLUMN].mean().sort_values(ascending=False).head(10)
             
-            return {
+            return ORJSONResponse({
                 "x_values": sector_prices.index.tolist(),
-                "y_values": sector_prices.round(2).tolist(),
+                "y_values": sector_prices.round(2).to_numpy(),
                 "categories": ["Residential"] * len(sector_prices)
-            }
+            })
         else:
             raise HTTPException(status_code=500, detail="Required columns not available for price trend")
                 
@@ -1063,18 +1595,35 @@ async def debug_info():
         "data_viz_columns": data_viz.columns.tolist() if not data_viz.empty else []
     }
 
-# Serve other frontend files
-@app.get("/{path:path}")
-async def serve_static(path: str):
-    static_file = os.path.join(frontend_path, path)
-    if os.path.exists(static_file) and os.path.isfile(static_file):
-        return FileResponse(static_file)
-    # Fallback to index.html for SPA routing
-    frontend_index = os.path.join(frontend_path, "index.html")
-    if os.path.exists(frontend_index):
-        return FileResponse(frontend_index)
-    return {"message": "File not found"}
+# ------------------ FRONTEND ------------------
+
+class SPAStaticFiles(StaticFiles):
+    """StaticFiles that falls back to index.html for unknown paths and sets Cache-Control"""
+
+    async def get_response(self, path, scope):
+        try:
+            response = await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            if e.status_code != 404:
+                raise
+            # SPA routing: unknown paths get the app shell
+            response = await super().get_response("index.html", scope)
+        # Assets aren't fingerprinted, so the shell always revalidates (ETag/Last-Modified -> 304)
+        is_html = response.headers.get("content-type", "").startswith("text/html")
+        response.headers["Cache-Control"] = "no-cache" if is_html else "public, max-age=3600"
+        return response
+
+# Mounted last so every API route above takes precedence over the catch-all file lookup
+if os.path.exists(frontend_path):
+    app.mount("/", SPAStaticFiles(directory=frontend_path, html=True), name="frontend")
+else:
+    @app.get("/{path:path}")
+    async def serve_static(path: str):
+        return {"message": "Frontend files not found"}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Single process for local runs. Multi-worker deployments start workers with the uvicorn CLI
+    # (render.yaml passes --workers $WEB_CONCURRENCY), so no supervisor process loads the model and
+    # matrices only to hold them idle. uvicorn[standard] picks uvloop and httptools when installed.
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
@@ -0,0 +1,92 @@
+"""
+One-off migration of the recommender's pickled matrices to .npy files.
+
+The weighted sum of the three cosine similarity matrices that the recommender uses is
+stored pre-fused as float32; the individual matrices stay full precision in their pickles.
+The location distance DataFrame is split into a float32 distance matrix (whole metres,
+so float32 holds them) plus a JSON file of its row/column labels, and its per-landmark
+sorted radius index is saved too so API workers map it instead of each sorting a copy.
+
+app.py memory-maps the .npy files (np.load(mmap_mode="r")) when present and falls back
+to the pickles otherwise.
+
+The analysis CSV is also rewritten as Parquet with its numeric columns already coerced,
+so app.py and the Streamlit analysis page skip CSV parsing and the to_numeric pass, and
+the df.pkl DataFrame behind the API's dropdowns and stats is copied to Parquet as well.
+"""
+import os
+import json
+import joblib
+import numpy as np
+import pandas as pd
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Dataset")
+
+# Must match the weights the recommender applies to cosine_sim1/2/3
+COSINE_WEIGHTS = (0.5, 0.8, 1.0)
+
+# data_viz1.csv columns that may hold stray strings; coerced to float before writing Parquet
+DATA_VIZ_NUMERIC_COLUMNS = ["price", "price_per_sqft", "built_up_area", "latitude", "longitude"]
+
+# Rows fused per block, so the float64 temporaries stay cache-sized instead of N x N
+FUSE_BLOCK_ROWS = 512
+
+def convert_cosine_matrices():
+    """Write the fused cosine_sim_combined_f32.npy from the full-precision cosine_sim{1,2,3}.pkl"""
+    matrices = [np.asarray(joblib.load(os.path.join(DATASET_PATH, f"cosine_sim{i}.pkl"))) for i in (1, 2, 3)]
+
+    # Fuse from the full-precision pickles block by block, writing each block straight into
+    # the memory-mapped output and rounding to float32 once per element
+    combined_path = os.path.join(DATASET_PATH, "cosine_sim_combined_f32.npy")
+    combined = np.lib.format.open_memmap(combined_path, mode="w+", dtype=np.float32, shape=matrices[0].shape)
+    for start in range(0, len(combined), FUSE_BLOCK_ROWS):
+        rows = slice(start, start + FUSE_BLOCK_ROWS)
+        block = None
+        for weight, matrix in zip(COSINE_WEIGHTS, matrices):
+            block = weight * matrix[rows] if block is None else block + weight * matrix[rows]
+        combined[rows] = block
+    combined.flush()
+    print(f"✅ {combined_path}: {combined.shape} {os.path.getsize(combined_path) / 1e6:.2f} MB")
+
+def convert_location_distance():
+    """Write location_distance.npy (apartments x landmarks, float32 metres), location_labels.json and the radius index"""
+    location_df = joblib.load(os.path.join(DATASET_PATH, "location_distance.pkl"))
+    npy_path = os.path.join(DATASET_PATH, "location_distance.npy")
+    # Saved in the pickle's column-major order so each landmark column stays contiguous
+    np.save(npy_path, location_df.to_numpy(dtype=np.float32))
+    with open(os.path.join(DATASET_PATH, "location_labels.json"), "w") as f:
+        json.dump({
+            "apartments": location_df.index.tolist(),
+            "locations": location_df.columns.tolist()
+        }, f)
+    print(f"✅ {npy_path}: {location_df.shape} {os.path.getsize(npy_path) / 1e6:.2f} MB")
+
+    # Radius index, built exactly as app.py does: each landmark column's apartment positions
+    # (int32) and distances in stable ascending order, Fortran-ordered so a column is contiguous
+    distances = location_df.to_numpy(dtype=np.float32)
+    order = np.asfortranarray(np.argsort(distances, axis=0, kind="stable").astype(np.int32))
+    np.save(os.path.join(DATASET_PATH, "location_order.npy"), order)
+    np.save(os.path.join(DATASET_PATH, "location_sorted.npy"), np.asfortranarray(np.take_along_axis(distances, order, axis=0)))
+    print(f"✅ Location radius index: {order.shape}")
+
+def convert_data_viz(dataset_path=DATASET_PATH):
+    """Write data_viz1.parquet (snappy) from data_viz1.csv with the numeric columns coerced"""
+    data = pd.read_csv(os.path.join(dataset_path, "data_viz1.csv"))
+    num_cols = [col for col in DATA_VIZ_NUMERIC_COLUMNS if col in data.columns]
+    data[num_cols] = data[num_cols].apply(pd.to_numeric, errors="coerce")
+    parquet_path = os.path.join(dataset_path, "data_viz1.parquet")
+    data.to_parquet(parquet_path, engine="pyarrow", compression="snappy", index=False)
+    print(f"✅ {parquet_path}: {data.shape} {os.path.getsize(parquet_path) / 1e6:.2f} MB")
+
+def convert_df():
+    """Write df.parquet (snappy) from the df.pkl DataFrame"""
+    data = joblib.load(os.path.join(DATASET_PATH, "df.pkl"))
+    parquet_path = os.path.join(DATASET_PATH, "df.parquet")
+    data.to_parquet(parquet_path, engine="pyarrow", compression="snappy", index=False)
+    print(f"✅ {parquet_path}: {data.shape} {os.path.getsize(parquet_path) / 1e6:.2f} MB")
+
+if __name__ == "__main__":
+    convert_cosine_matrices()
+    convert_location_distance()
+    convert_data_viz()
+    convert_df()
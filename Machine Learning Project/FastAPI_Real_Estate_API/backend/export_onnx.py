@@ -0,0 +1,36 @@
+"""
+One-off export of Dataset/pipeline_compressed.pkl to Dataset/pipeline.onnx.
+
+app.py serves predictions through ONNX Runtime when pipeline.onnx is present and
+onnxruntime is installed, and falls back to the sklearn pipeline otherwise.
+Requires skl2onnx (pip install skl2onnx) in addition to requirements.txt.
+"""
+import os
+import joblib
+import pandas as pd
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType, StringTensorType
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Dataset")
+PIPELINE_FILE = os.path.join(DATASET_PATH, "pipeline_compressed.pkl")
+DF_FILE = os.path.join(DATASET_PATH, "df.pkl")
+ONNX_FILE = os.path.join(DATASET_PATH, "pipeline.onnx")
+
+def export_pipeline():
+    """Convert the fitted sklearn pipeline into an ONNX graph with one named input per feature"""
+    pipeline = joblib.load(PIPELINE_FILE)
+    df = joblib.load(DF_FILE)
+
+    # The ColumnTransformer selects features by name, so each column becomes its own [None, 1] input
+    initial_types = [
+        (col, FloatTensorType([None, 1]) if pd.api.types.is_numeric_dtype(df[col]) else StringTensorType([None, 1]))
+        for col in pipeline.feature_names_in_
+    ]
+    onnx_model = convert_sklearn(pipeline, initial_types=initial_types, target_opset=17)
+
+    with open(ONNX_FILE, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    print(f"✅ Exported {ONNX_FILE} ({os.path.getsize(ONNX_FILE) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    export_pipeline()
@@ -0,0 +1,103 @@
+"""
+Top-k selection over one row of the fused cosine similarity matrix.
+
+Shared by the API (app.py) and the Streamlit recommender page
+(streamlit_app/04_Recommend_Appartments.py), so both rank apartments identically.
+
+The optional Numba kernel makes one pass over the row with a size-k min-heap, so a query
+allocates only the k-sized result instead of partition copies and masks of the whole row.
+Heap order is (score, -index), so ties at the cutoff keep the lower index like a stable sort.
+No fastmath: it would let the comparisons assume NaN-free input. Without Numba, an O(N)
+np.partition picks the same entries.
+
+The exact dense scan is deliberate: a row is N float32s (~1 KB for the 246 apartments), and
+only the fused N x N matrix ships, not the feature vectors an ANN index (Faiss/HNSW) would
+need. For the same reason there is no GPU (CuPy) path: a kernel launch plus copying k results
+back costs more than scanning a ~1 KB row on the CPU.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+topk_row = None
+
+if njit is not None:
+    @njit(cache=True)
+    def topk_row(sim_row, k, skip_idx):
+        """Return the k highest (index, score) pairs of sim_row, excluding skip_idx, in heap order"""
+        heap_indices = np.empty(k, dtype=np.int64)
+        heap_scores = np.empty(k, dtype=np.float64)
+        size = 0
+        for i in range(sim_row.shape[0]):
+            if i == skip_idx:
+                continue
+            score = sim_row[i]
+            if size < k:
+                # Indices arrive in increasing order, so an equal-score parent always ranks higher
+                # and the new entry moves above it
+                pos = size
+                size += 1
+                while pos > 0:
+                    parent = (pos - 1) // 2
+                    if heap_scores[parent] < score:
+                        break
+                    heap_indices[pos] = heap_indices[parent]
+                    heap_scores[pos] = heap_scores[parent]
+                    pos = parent
+            elif k > 0 and score > heap_scores[0]:
+                # Replace the weakest kept entry and sift it down
+                pos = 0
+                while True:
+                    child = 2 * pos + 1
+                    if child >= k:
+                        break
+                    if child + 1 < k and (heap_scores[child + 1] < heap_scores[child] or
+                                          (heap_scores[child + 1] == heap_scores[child] and
+                                           heap_indices[child + 1] > heap_indices[child])):
+                        child += 1
+                    if heap_scores[child] > score or (heap_scores[child] == score and heap_indices[child] < i):
+                        break
+                    heap_indices[pos] = heap_indices[child]
+                    heap_scores[pos] = heap_scores[child]
+                    pos = child
+            else:
+                continue
+            heap_indices[pos] = i
+            heap_scores[pos] = score
+        return heap_indices[:size], heap_scores[:size]
+
+def top_similar(sim_row, top_n, skip_idx):
+    """Return (indices, scores) of the top_n entries of sim_row other than skip_idx, best first.
+
+    Ties are ordered by index, like a stable sort; scores keep sim_row's dtype.
+    """
+    top_n = max(top_n, 0)
+    if topk_row is not None:
+        top_indices, top_scores = topk_row(sim_row, top_n, skip_idx)
+        order = np.lexsort((top_indices, -top_scores))
+        return top_indices[order], top_scores[order].astype(sim_row.dtype)
+
+    # Find the (N+1)-th best score with an O(N) partition, then sort only the candidates
+    # at or above it; keeping every tie at the cutoff and ordering ties by index
+    # matches a stable sort. The row's own apartment is excluded by index, since
+    # identical listings can tie with it for the top score.
+    k = min(top_n + 1, len(sim_row))
+    cutoff = np.partition(sim_row, len(sim_row) - k)[len(sim_row) - k]
+    candidates = np.flatnonzero(sim_row >= cutoff)
+    candidates = candidates[np.lexsort((candidates, -sim_row[candidates]))]
+    top_indices = candidates[candidates != skip_idx][:top_n]
+    return top_indices, sim_row[top_indices]
+
+def warm_up(sim_row):
+    """Compile the kernel for sim_row's dtype/layout; if that fails, disable it (NumPy path) and re-raise"""
+    global topk_row
+    if topk_row is None:
+        return
+    try:
+        top_similar(sim_row, 5, 0)
+    except Exception:
+        topk_row = None
+        raise
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# app.py is imported as a top-level module, as uvicorn does from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app as backend
+
+PROPERTY = {
+    "property_type": "flat", "sector": "sector 83", "bedrooms": 3, "bathroom": 3, "balcony": "3",
+    "property_age": "Relatively New", "built_up_area": 1600, "servant_room": 1, "store_room": 0,
+    "furnishing_type": "furnished", "luxury_category": "High", "floor_category": "Mid Floor"
+}
+
+pytestmark = pytest.mark.skipif(backend.pipeline is None, reason="pipeline artifacts not available")
+
+
+@pytest.fixture
+def client():
+    backend.PREDICTION_CACHE.clear()
+    # The startup event starts the batcher; server errors come back as 500 responses
+    with TestClient(backend.app, raise_server_exceptions=False) as test_client:
+        yield test_client
+
+
+def test_batcher_survives_failed_batch(client, monkeypatch):
+    def failing_predict_batch(rows):
+        raise RuntimeError("predict failed")
+
+    monkeypatch.setattr(backend, "predict_batch", failing_predict_batch)
+    response = client.post("/api/predict_price", json=PROPERTY)
+    assert response.status_code == 500
+    assert "predict failed" in response.json()["detail"]
+
+    monkeypatch.undo()
+    response = client.post("/api/predict_price", json=PROPERTY)
+    assert response.status_code == 200
+    assert response.json()["prediction_raw"] > 0
+
+
+def test_onnx_failure_falls_back_to_sklearn(client, monkeypatch):
+    class FailingSession:
+        def run(self, output_names, feeds):
+            raise RuntimeError("onnx failed")
+
+    expected = backend.predict_rows_sklearn([backend.input_row(backend.PropertyInput(**PROPERTY))])[0]
+    monkeypatch.setattr(backend, "onnx_session", FailingSession())
+    response = client.post("/api/predict_price", json=PROPERTY)
+    assert response.status_code == 200
+    assert response.json()["prediction_raw"] == pytest.approx(expected)
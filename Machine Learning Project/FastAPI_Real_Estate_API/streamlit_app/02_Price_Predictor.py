@@ -5,27 +5,65 @@ import pandas as pd
 import numpy as np
 import os
 import pickle
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
 
 # Define base directory and file paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODEL_PATH = os.path.join(BASE_DIR, "Dataset", "pipeline_compressed.pkl")
 DATA_PATH = os.path.join(BASE_DIR, "Dataset", "df.pkl")
+ONNX_PATH = os.path.join(BASE_DIR, "Dataset", "pipeline.onnx")
+
+# Loaded once per server process: Streamlit reruns this script on every widget
+# interaction, and both objects are only read
+@st.cache_resource
+def load_df(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+@st.cache_resource
+def load_pipeline(path):
+    return joblib.load(path)
+
+@st.cache_resource
+def load_onnx_session(path):
+    return ort.InferenceSession(path, providers=["CPUExecutionProvider"])
 
 # Load DataFrame
 if os.path.exists(DATA_PATH):
-    with open(DATA_PATH, "rb") as f:
-        df = pickle.load(f)
+    df = load_df(DATA_PATH)
 else:
     st.error(f"Data file not found at {DATA_PATH}")
     raise FileNotFoundError(f"Data file not found at {DATA_PATH}")
 
 # Load model pipeline
 if os.path.exists(MODEL_PATH):
-    pipeline = joblib.load(MODEL_PATH)
+    pipeline = load_pipeline(MODEL_PATH)
 else:
     st.error(f"Model file not found at {MODEL_PATH}")
     raise FileNotFoundError(f"Model file not found at {MODEL_PATH}")
 
+# Dropdown options: one .unique() scan per column per data file instead of per widget per rerun.
+# Numeric-looking columns are sorted; the rest keep their order of appearance, as before.
+SORTED_OPTION_COLUMNS = {"bedRoom", "bathroom", "balcony"}
+
+@st.cache_resource
+def load_dropdown_options(path):
+    df = load_df(path)
+    return {
+        col: tuple(sorted(df[col].unique()) if col in SORTED_OPTION_COLUMNS else df[col].unique())
+        for col in ["property_type", "sector", "bedRoom", "bathroom", "balcony", "agePossession",
+                    "servant room", "store room", "furnishing_type", "luxury_category", "floor_category"]
+    }
+
+options = load_dropdown_options(DATA_PATH)
+
+# Optional ONNX graph exported by backend/export_onnx.py: preprocessing and the forest run
+# as native kernels instead of sklearn's per-step Python dispatch
+onnx_session = load_onnx_session(ONNX_PATH) if ort is not None and os.path.exists(ONNX_PATH) else None
+
 # --- Your predictor UI logic here ---
 # ----------------------------
 # Utility
@@ -43,37 +81,50 @@ st.write("Enter property details below to predict the price range.")
 col1, col2 = st.columns(2)
 
 with col1:
-    property_type = st.selectbox("Property Type", df["property_type"].unique())
-    sector = st.selectbox("Sector", df["sector"].unique())
-    bedroom = st.selectbox("Bedrooms", sorted(df["bedRoom"].unique()))
-    bathroom = st.selectbox("Bathrooms", sorted(df["bathroom"].unique()))
-    balcony = st.selectbox("Balconies", sorted(df["balcony"].unique()))
+    property_type = st.selectbox("Property Type", options["property_type"])
+    sector = st.selectbox("Sector", options["sector"])
+    bedroom = st.selectbox("Bedrooms", options["bedRoom"])
+    bathroom = st.selectbox("Bathrooms", options["bathroom"])
+    balcony = st.selectbox("Balconies", options["balcony"])
 
 with col2:
-    age_possession = st.selectbox("Age / Possession", df["agePossession"].unique())
+    age_possession = st.selectbox("Age / Possession", options["agePossession"])
     built_up_area = st.number_input("Built-up Area (sq ft)", min_value=500, max_value=10000, step=50)
-    servant_room = st.selectbox("Servant Room", df["servant room"].unique())
-    store_room = st.selectbox("Store Room", df["store room"].unique())
-    furnishing_type = st.selectbox("Furnishing Type", df["furnishing_type"].unique())
-
-luxury_category = st.selectbox("Luxury Category", df["luxury_category"].unique())
-floor_category = st.selectbox("Floor Category", df["floor_category"].unique())
-
-# Collect input
-input_data = pd.DataFrame([[
-    property_type, sector, bedroom, bathroom, balcony, age_possession,
-    built_up_area, servant_room, store_room, furnishing_type,
-    luxury_category, floor_category
-]], columns=[
+    servant_room = st.selectbox("Servant Room", options["servant room"])
+    store_room = st.selectbox("Store Room", options["store room"])
+    furnishing_type = st.selectbox("Furnishing Type", options["furnishing_type"])
+
+luxury_category = st.selectbox("Luxury Category", options["luxury_category"])
+floor_category = st.selectbox("Floor Category", options["floor_category"])
+
+PREDICTION_COLUMNS = [
     "property_type", "sector", "bedRoom", "bathroom", "balcony",
     "agePossession", "built_up_area", "servant room", "store room",
     "furnishing_type", "luxury_category", "floor_category"
-])
+]
 
 # Prediction
 if st.button("💰 Predict Price"):
+    row = [
+        property_type, sector, bedroom, bathroom, balcony, age_possession,
+        built_up_area, servant_room, store_room, furnishing_type,
+        luxury_category, floor_category
+    ]
     try:
-        base_price = np.expm1(pipeline.predict(input_data))[0]
+        if onnx_session is not None:
+            # One [1, 1] tensor per column; skl2onnx names inputs after the columns with
+            # spaces replaced. Options come from df, so every category is a fitted one.
+            values = {col.replace(" ", "_"): value for col, value in zip(PREDICTION_COLUMNS, row)}
+            feeds = {
+                inp.name: np.array([[values[inp.name]]], dtype=np.float32 if inp.type == "tensor(float)" else object)
+                for inp in onnx_session.get_inputs()
+            }
+            base_price = np.expm1(float(onnx_session.run(None, feeds)[0].ravel()[0]))
+        else:
+            # Built column by column: the pipeline selects features by name, and this
+            # skips DataFrame(rows, columns=...)'s 2-D object array
+            input_data = pd.DataFrame({col: [value] for col, value in zip(PREDICTION_COLUMNS, row)})
+            base_price = np.expm1(pipeline.predict(input_data))[0]
         low_price, high_price = base_price - 0.22, base_price + 0.22
         st.success(f"Predicted Price Range: {format_price(low_price)} - {format_price(high_price)}")
     except Exception as e:
@@ -16,18 +16,41 @@ DATASET_DIR = os.path.join(BASE_DIR, "Dataset")
 
 # Paths
 DATASET_PATH = os.path.join(DATASET_DIR, "data_viz1.csv")
+PARQUET_PATH = os.path.join(DATASET_DIR, "data_viz1.parquet")
 FEATURE_PATH = os.path.join(DATASET_DIR, "feature_text.pkl")
 
-# Load data
-new_df = pd.read_csv(DATASET_PATH)
-feature_text = pickle.load(open(FEATURE_PATH, "rb"))
-
-# Convert numeric columns
 num_cols = ["price", "price_per_sqft", "built_up_area", "latitude", "longitude"]
-new_df[num_cols] = new_df[num_cols].apply(pd.to_numeric, errors="coerce")
+property_types = ["flat", "house"]
+
+
+@st.cache_resource
+def load_analysis_data():
+    """Load the analysis data once per server process; the page only reads it"""
+    # data_viz1.parquet (backend/convert_matrices.py) is typed already, so no to_numeric pass
+    if os.path.exists(PARQUET_PATH):
+        data = pd.read_parquet(PARQUET_PATH, engine="pyarrow")
+    else:
+        data = pd.read_csv(DATASET_PATH)
+        data[num_cols] = data[num_cols].apply(pd.to_numeric, errors="coerce")
+    return data, pickle.load(open(FEATURE_PATH, "rb"))
+
+
+new_df, feature_text = load_analysis_data()
+
 
-# Group by sector
-group_df = new_df.groupby("sector")[num_cols].mean()
+@st.cache_resource
+def build_analysis_views():
+    """Sector means and per-property_type / per-sector frames, computed once instead of on every widget change"""
+    group_df = new_df.groupby("sector")[num_cols].mean()
+    groups = dict(tuple(new_df.groupby("property_type", sort=False)))
+    # Every dropdown type gets a frame, empty when the data has none (like the boolean filter did)
+    by_property_type = {pt: groups.get(pt, new_df.iloc[0:0]) for pt in property_types}
+    # Appearance order, so the sector dropdown keeps its previous ordering
+    by_sector = dict(tuple(new_df.groupby("sector", sort=False)))
+    return group_df, by_property_type, by_sector
+
+
+group_df, by_property_type, by_sector = build_analysis_views()
 
 # --- Sector Price per Sqft Geomap ---
 st.header("Sector Price per Sqft Geomap")
@@ -47,24 +70,28 @@ fig = px.scatter_map(
 st.plotly_chart(fig, use_container_width=True)
 
 # --- Features Wordcloud ---
-st.header("Features Wordcloud")
-wordcloud = WordCloud(
-    width=800,
-    height=800,
-    background_color="black",
-    stopwords=set(["s"]),
-    min_font_size=10,
-).generate(feature_text)
+@st.cache_resource
+def render_wordcloud():
+    """Generate the feature wordcloud once per server process; the text never changes"""
+    return WordCloud(
+        width=800,
+        height=800,
+        background_color="black",
+        stopwords=set(["s"]),
+        min_font_size=10,
+    ).generate(feature_text).to_array()
 
+
+st.header("Features Wordcloud")
 fig_wc, ax_wc = plt.subplots(figsize=(8, 8))
-ax_wc.imshow(wordcloud, interpolation="bilinear")
+ax_wc.imshow(render_wordcloud(), interpolation="bilinear")
 ax_wc.axis("off")
 st.pyplot(fig_wc)
 
 # --- Area Vs Price ---
 st.header("Area Vs Price")
-property_type = st.selectbox("Select Property Type", ["flat", "house"])
-filtered_df = new_df[new_df["property_type"] == property_type]
+property_type = st.selectbox("Select Property Type", property_types)
+filtered_df = by_property_type[property_type]
 fig1 = px.scatter(
     filtered_df,
     x="built_up_area",
@@ -76,14 +103,14 @@ st.plotly_chart(fig1, use_container_width=True)
 
 # --- BHK Pie Chart ---
 st.header("BHK Pie Chart")
-sector_options = ["overall"] + new_df["sector"].unique().tolist()
+sector_options = ["overall"] + list(by_sector)
 selected_sector = st.selectbox("Select Sector", sector_options)
 
 if selected_sector == "overall":
     fig2 = px.pie(new_df, names="bedRoom", title="Distribution of BHK in Overall Data")
 else:
     fig2 = px.pie(
-        new_df[new_df["sector"] == selected_sector],
+        by_sector[selected_sector],
         names="bedRoom",
         title=f"Distribution of BHK in {selected_sector}",
     )
@@ -92,8 +119,8 @@ st.plotly_chart(fig2, use_container_width=True)
 # --- Side by Side Distplot ---
 st.header("Side by Side Distplot for Property Type")
 fig_dist, ax_dist = plt.subplots(figsize=(10, 4))
-sns.histplot(new_df[new_df["property_type"] == "house"]["price"], label="house", kde=True, ax=ax_dist)
-sns.histplot(new_df[new_df["property_type"] == "flat"]["price"], label="flat", kde=True, ax=ax_dist)
+sns.histplot(by_property_type["house"]["price"], label="house", kde=True, ax=ax_dist)
+sns.histplot(by_property_type["flat"]["price"], label="flat", kde=True, ax=ax_dist)
 ax_dist.legend()
 ax_dist.set_title("Price Distribution by Property Type")
 st.pyplot(fig_dist)
@@ -4,36 +4,100 @@ import pickle
 import pandas as pd
 import numpy as np
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 st.title("Recommend Apartments")
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATASET_DIR = os.path.join(BASE_DIR, "Dataset")
 
+# Top-k selection is shared with the API so both rank apartments identically
+BACKEND_DIR = os.path.join(BASE_DIR, "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+import similarity_topk
+
 LOC_PATH = os.path.join(DATASET_DIR, "location_distance.pkl")
 SIM1_PATH = os.path.join(DATASET_DIR, "cosine_sim1.pkl")
 SIM2_PATH = os.path.join(DATASET_DIR, "cosine_sim2.pkl")
 SIM3_PATH = os.path.join(DATASET_DIR, "cosine_sim3.pkl")
+SIM_FUSED_PATH = os.path.join(DATASET_DIR, "cosine_sim_combined_f32.npy")
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+@st.cache_resource
+def load_recommender_data():
+    """Load the recommender artifacts once per server process instead of on every rerun"""
+    # The pickles are independent disk reads, so they load concurrently on a thread pool
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        location_future = executor.submit(load_pickle, LOC_PATH)
+
+        # Pre-fused float32 matrix from backend/convert_matrices.py, memory-mapped so only the rows
+        # read are paged in; otherwise fuse the pickles once, in place, as float32
+        if os.path.exists(SIM_FUSED_PATH):
+            cosine_sim_matrix = np.load(SIM_FUSED_PATH, mmap_mode="r")
+        else:
+            sim_futures = [executor.submit(load_pickle, path) for path in (SIM1_PATH, SIM2_PATH, SIM3_PATH)]
+            cosine_sim1, cosine_sim2, cosine_sim3 = (future.result() for future in sim_futures)
+            cosine_sim_matrix = np.multiply(cosine_sim1, 0.5, dtype=np.float32)
+            cosine_sim_matrix += np.multiply(cosine_sim2, 0.8, dtype=np.float32)
+            np.add(cosine_sim_matrix, cosine_sim3, out=cosine_sim_matrix)
+
+        location_df = location_future.result()
+
+    # Each recommendation reads one row: keep it a unit-stride float32 run (strides == (N * 4, 4))
+    if cosine_sim_matrix.dtype != np.float32 or not cosine_sim_matrix.flags["C_CONTIGUOUS"]:
+        cosine_sim_matrix = np.ascontiguousarray(cosine_sim_matrix, dtype=np.float32)
+
+    # Property name -> row position, so lookups skip the pandas Index
+    property_index = {name: i for i, name in enumerate(location_df.index)}
+    return location_df, cosine_sim_matrix, property_index
+
+
+location_df, cosine_sim_matrix, property_index = load_recommender_data()
+
+
+@st.cache_resource
+def load_location_index():
+    """Sort every landmark column once, so a radius search is a binary search plus a slice"""
+    distances = location_df.to_numpy()
+    # Fortran order keeps each landmark's column contiguous
+    order = np.asfortranarray(np.argsort(distances, axis=0, kind="stable"))
+    sorted_distances = np.asfortranarray(np.take_along_axis(distances, order, axis=0))
+    column_index = {name: i for i, name in enumerate(location_df.columns)}
+    return order, sorted_distances, column_index
+
+
+location_order, location_sorted, location_column_index = load_location_index()
+
+
+@st.cache_resource
+def warm_up_topk():
+    """Compile the shared top-k kernel once per server process on the loaded matrix"""
+    try:
+        similarity_topk.warm_up(cosine_sim_matrix[0])
+    except Exception:
+        pass  # the kernel is disabled and top_similar uses NumPy
+
 
-location_df = pickle.load(open(LOC_PATH, "rb"))
-cosine_sim1 = pickle.load(open(SIM1_PATH, "rb"))
-cosine_sim2 = pickle.load(open(SIM2_PATH, "rb"))
-cosine_sim3 = pickle.load(open(SIM3_PATH, "rb"))
+warm_up_topk()
 
 
 def recommend_properties_with_scores(property_name, top_n=5):
-    cosine_sim_matrix = 0.5 * cosine_sim1 + 0.8 * cosine_sim2 + 1.0 * cosine_sim3
-    if property_name not in location_df.index:
+    if property_name not in property_index:
         st.error("Property not found in dataset")
         return pd.DataFrame(columns=["PropertyName", "SimilarityScore"])
 
-    sim_scores = list(enumerate(cosine_sim_matrix[location_df.index.get_loc(property_name)]))
-    sorted_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-    top_indices = [i[0] for i in sorted_scores[1 : top_n + 1]]
-    top_scores = [i[1] for i in sorted_scores[1 : top_n + 1]]
-    top_properties = location_df.index[top_indices].tolist()
+    idx = property_index[property_name]
+    sim_row = cosine_sim_matrix[idx]
 
-    return pd.DataFrame({"PropertyName": top_properties, "SimilarityScore": top_scores})
+    top_indices, top_scores = similarity_topk.top_similar(sim_row, top_n, idx)
+    return pd.DataFrame({"PropertyName": location_df.index.values[top_indices], "SimilarityScore": top_scores})
 
 # --- Location search ---
 st.header("Select Location and Radius")
@@ -42,8 +106,11 @@ radius = st.number_input("Radius in Kms", min_value=0.0, step=0.1)
 
 if st.button("Search"):
     if radius > 0:
-        result_ser = location_df[location_df[selected_location] < radius * 1000][selected_location].sort_values()
-        for key, value in result_ser.items():
+        # The pre-sorted column's prefix below the radius is the answer (same order as a stable sort)
+        col = location_column_index[selected_location]
+        count = np.searchsorted(location_sorted[:, col], radius * 1000)
+        nearby = location_order[:count, col]
+        for key, value in zip(location_df.index.values[nearby], location_sorted[:count, col]):
             st.text(f"{key} {round(value / 1000)} kms")
     else:
         st.warning("Please enter a valid radius.")
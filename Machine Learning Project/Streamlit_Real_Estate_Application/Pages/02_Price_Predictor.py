@@ -5,26 +5,43 @@ import numpy as np
 
 st.title("Price Predictor")
 
-# Load data and model
-with open('../df.pkl', 'rb') as file:
-    df = pickle.load(file)
-
-with open('../pipeline.pkl', 'rb') as file:
-    pipeline = pickle.load(file)
+# Load data and model once per server process; Streamlit reruns this script on every
+# widget interaction, and both objects are only read
+@st.cache_resource
+def load_artifacts():
+    with open('../df.pkl', 'rb') as file:
+        df = pickle.load(file)
+
+    with open('../pipeline.pkl', 'rb') as file:
+        pipeline = pickle.load(file)
+    return df, pipeline
+
+df, pipeline = load_artifacts()
+
+# Sorted dropdown options, computed once instead of a .unique() scan per widget per rerun
+@st.cache_resource
+def load_dropdown_options():
+    return {
+        col: sorted(df[col].unique().tolist())
+        for col in ['sector', 'bedRoom', 'bathroom', 'balcony', 'agePossession',
+                    'furnishing_type', 'luxury_category', 'floor_category']
+    }
+
+options = load_dropdown_options()
 st.header('Enter your inputs')
 
 # User inputs
 property_type = st.selectbox('Property Type', ['flat', 'house'])
 
-sector = st.selectbox('Sector', sorted(df['sector'].unique().tolist()))
+sector = st.selectbox('Sector', options['sector'])
 
-bedrooms = float(st.selectbox('Number of Bedroom', sorted(df['bedRoom'].unique().tolist())))
+bedrooms = float(st.selectbox('Number of Bedroom', options['bedRoom']))
 
-bathroom = float(st.selectbox('Number of Bathrooms', sorted(df['bathroom'].unique().tolist())))
+bathroom = float(st.selectbox('Number of Bathrooms', options['bathroom']))
 
-balcony = st.selectbox('Balconies', sorted(df['balcony'].unique().tolist()))
+balcony = st.selectbox('Balconies', options['balcony'])
 
-property_age = st.selectbox('Property Age', sorted(df['agePossession'].unique().tolist()))
+property_age = st.selectbox('Property Age', options['agePossession'])
 
 built_up_area = float(st.number_input('Built Up Area', min_value=0.0, step=0.1))
 
@@ -32,21 +49,22 @@ servant_room = float(st.selectbox('Servant Room', [0.0, 1.0]))
 
 store_room = float(st.selectbox('Store Room', [0.0, 1.0]))
 
-furnishing_type = st.selectbox('Furnishing Type', sorted(df['furnishing_type'].unique().tolist()))
+furnishing_type = st.selectbox('Furnishing Type', options['furnishing_type'])
 
-luxury_category = st.selectbox('Luxury Category', sorted(df['luxury_category'].unique().tolist()))
+luxury_category = st.selectbox('Luxury Category', options['luxury_category'])
 
-floor_category = st.selectbox('Floor Category', sorted(df['floor_category'].unique().tolist()))
+floor_category = st.selectbox('Floor Category', options['floor_category'])
 
 if st.button('Predict'):
 
-    # Form a DataFrame
-    data = [[property_type, sector, bedrooms, bathroom, balcony, property_age, built_up_area, servant_room, store_room, furnishing_type, luxury_category, floor_category]]
+    # Form a one-row DataFrame column by column (the pipeline selects features by name);
+    # this skips the 2-D object array and per-column type inference of DataFrame(data, columns=...)
+    data = [property_type, sector, bedrooms, bathroom, balcony, property_age, built_up_area, servant_room, store_room, furnishing_type, luxury_category, floor_category]
     columns = ['property_type', 'sector', 'bedRoom', 'bathroom', 'balcony',
                'agePossession', 'built_up_area', 'servant room', 'store room',
                'furnishing_type', 'luxury_category', 'floor_category']
 
-    one_df = pd.DataFrame(data, columns=columns)
+    one_df = pd.DataFrame({column: [value] for column, value in zip(columns, data)})
 
     # Predict
     base_price = np.expm1(pipeline.predict(one_df))[0]
@@ -5,18 +5,40 @@ import pickle
 import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
+import os
 
 st.title("Analysis")
-# Load the data
-new_df = pd.read_csv('../Dataset/data_viz1.csv')
-feature_text = pickle.load(open('../Dataset/feature_text.pkl', 'rb'))
 
-# Convert the necessary columns to numeric, coercing errors will turn non-convertible values into NaN
-new_df[['price', 'price_per_sqft', 'built_up_area', 'latitude', 'longitude']] = new_df[['price', 'price_per_sqft', 'built_up_area', 'latitude', 'longitude']].apply(pd.to_numeric, errors='coerce')
-
-# Group by 'sector' and calculate mean on numeric columns only
 numeric_cols = ['price', 'price_per_sqft', 'built_up_area', 'latitude', 'longitude']
-group_df = new_df.groupby('sector')[numeric_cols].mean()
+property_types = ['flat', 'house']
+
+# Load the data once per server process instead of on every rerun (it is only read)
+@st.cache_resource
+def load_analysis_data():
+    # data_viz1.parquet is written with the numeric columns already typed, so no to_numeric pass
+    if os.path.exists('../Dataset/data_viz1.parquet'):
+        data = pd.read_parquet('../Dataset/data_viz1.parquet', engine='pyarrow')
+    else:
+        data = pd.read_csv('../Dataset/data_viz1.csv')
+        # Convert the necessary columns to numeric, coercing errors will turn non-convertible values into NaN
+        data[numeric_cols] = data[numeric_cols].apply(pd.to_numeric, errors='coerce')
+    return data, pickle.load(open('../Dataset/feature_text.pkl', 'rb'))
+
+new_df, feature_text = load_analysis_data()
+
+# Derived frames the charts read, computed once instead of on every widget change
+@st.cache_resource
+def build_analysis_views():
+    # Group by 'sector' and calculate mean on numeric columns only
+    group_df = new_df.groupby('sector')[numeric_cols].mean()
+    groups = dict(tuple(new_df.groupby('property_type', sort=False)))
+    # Every dropdown type gets a frame, empty when the data has none (like the boolean filter did)
+    by_property_type = {pt: groups.get(pt, new_df.iloc[0:0]) for pt in property_types}
+    # Appearance order, so the sector dropdown keeps its previous ordering
+    by_sector = dict(tuple(new_df.groupby('sector', sort=False)))
+    return group_df, by_property_type, by_sector
+
+group_df, by_property_type, by_sector = build_analysis_views()
 
 
 # Sector Price per Sqft Geomap
@@ -37,27 +59,31 @@ fig = px.scatter_mapbox(
 st.plotly_chart(fig, use_container_width=True)
 
 # Features Wordcloud
+# Generate the image once per server process instead of on every rerun (the text never changes)
+@st.cache_resource
+def render_wordcloud():
+    return WordCloud(
+        width=800,
+        height=800,
+        background_color='black',
+        stopwords=set(['s']),  # Any stopwords you'd like to exclude
+        min_font_size=10
+    ).generate(feature_text).to_array()
+
 st.header('Features Wordcloud')
-wordcloud = WordCloud(
-    width=800,
-    height=800,
-    background_color='black',
-    stopwords=set(['s']),  # Any stopwords you'd like to exclude
-    min_font_size=10
-).generate(feature_text)
 
 # Create figure explicitly
 fig_wc, ax_wc = plt.subplots(figsize=(8, 8), facecolor=None)
-ax_wc.imshow(wordcloud, interpolation='bilinear')
+ax_wc.imshow(render_wordcloud(), interpolation='bilinear')
 ax_wc.axis("off")
 plt.tight_layout(pad=0)
 st.pyplot(fig_wc)  # Pass the figure to st.pyplot
 
 # Area Vs Price
 st.header('Area Vs Price')
-property_type = st.selectbox('Select Property Type', ['flat', 'house'])
+property_type = st.selectbox('Select Property Type', property_types)
 
-filtered_df = new_df[new_df['property_type'] == property_type]
+filtered_df = by_property_type[property_type]
 fig1 = px.scatter(
     filtered_df,
     x="built_up_area",
@@ -69,23 +95,22 @@ st.plotly_chart(fig1, use_container_width=True)
 
 # BHK Pie Chart
 st.header('BHK Pie Chart')
-sector_options = new_df['sector'].unique().tolist()
-sector_options.insert(0, 'overall')
+sector_options = ['overall'] + list(by_sector)
 
 selected_sector = st.selectbox('Select Sector', sector_options)
 
 if selected_sector == 'overall':
     fig2 = px.pie(new_df, names='bedRoom', title='Distribution of BHK in Overall Data')
 else:
-    fig2 = px.pie(new_df[new_df['sector'] == selected_sector], names='bedRoom', title=f'Distribution of BHK in {selected_sector}')
+    fig2 = px.pie(by_sector[selected_sector], names='bedRoom', title=f'Distribution of BHK in {selected_sector}')
 
 st.plotly_chart(fig2, use_container_width=True)
 
 # Side by Side Distplot for Property Type
 st.header('Side by Side Distplot for Property Type')
 fig_dist, ax_dist = plt.subplots(figsize=(10, 4))
-sns.histplot(new_df[new_df['property_type'] == 'house']['price'], label='house', kde=True, ax=ax_dist)
-sns.histplot(new_df[new_df['property_type'] == 'flat']['price'], label='flat', kde=True, ax=ax_dist)
+sns.histplot(by_property_type['house']['price'], label='house', kde=True, ax=ax_dist)
+sns.histplot(by_property_type['flat']['price'], label='flat', kde=True, ax=ax_dist)
 ax_dist.legend()
 ax_dist.set_title('Price Distribution by Property Type')
 st.pyplot(fig_dist)  # Pass the figure to st.pyplot
\ No newline at end of file
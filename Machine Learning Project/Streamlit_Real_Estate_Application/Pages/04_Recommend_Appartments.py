@@ -2,40 +2,82 @@ import streamlit as st
 import pickle
 import pandas as pd
 import numpy as np
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 st.title("Recommend Appartment")
 
-# Load data
-location_df = pickle.load(open('../Dataset/location_distance.pkl', 'rb'))
-cosine_sim1 = pickle.load(open('../Dataset/cosine_sim1.pkl', 'rb'))
-cosine_sim2 = pickle.load(open('../Dataset/cosine_sim2.pkl', 'rb'))
-cosine_sim3 = pickle.load(open('../Dataset/cosine_sim3.pkl', 'rb'))
+def load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+# Load data once per server process instead of on every rerun (all of it is only read)
+@st.cache_resource
+def load_recommender_data():
+    # The pickles are independent disk reads, so they load concurrently on a thread pool
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        location_future = executor.submit(load_pickle, '../Dataset/location_distance.pkl')
+
+        # Pre-fused float32 matrix (0.5*sim1 + 0.8*sim2 + 1*sim3, written by the backend's
+        # convert_matrices.py), memory-mapped so only the rows read are paged in
+        if os.path.exists('../Dataset/cosine_sim_combined_f32.npy'):
+            cosine_sim_matrix = np.load('../Dataset/cosine_sim_combined_f32.npy', mmap_mode='r')
+        else:
+            sim_futures = [executor.submit(load_pickle, f'../Dataset/cosine_sim{i}.pkl') for i in (1, 2, 3)]
+            cosine_sim1, cosine_sim2, cosine_sim3 = (future.result() for future in sim_futures)
+
+            # Combine cosine similarity matrices once, in place, instead of on every recommendation
+            cosine_sim_matrix = np.multiply(cosine_sim1, 0.5, dtype=np.float32)
+            cosine_sim_matrix += np.multiply(cosine_sim2, 0.8, dtype=np.float32)
+            np.add(cosine_sim_matrix, cosine_sim3, out=cosine_sim_matrix)
+
+        location_df = location_future.result()
+
+    # Each recommendation reads one row, so keep the matrix row-major float32 (a Fortran-ordered
+    # file would otherwise make every row a strided gather); a conforming .npy stays memory-mapped
+    if cosine_sim_matrix.dtype != np.float32 or not cosine_sim_matrix.flags['C_CONTIGUOUS']:
+        cosine_sim_matrix = np.ascontiguousarray(cosine_sim_matrix, dtype=np.float32)
+
+    # Property name -> row position, so lookups skip the pandas Index
+    property_index = {name: i for i, name in enumerate(location_df.index)}
+    return location_df, cosine_sim_matrix, property_index
+
+location_df, cosine_sim_matrix, property_index = load_recommender_data()
+
+# Radius index: every landmark column sorted once (Fortran order keeps each column contiguous),
+# so a search is a binary search plus a slice instead of a mask and sort per click
+@st.cache_resource
+def load_location_index():
+    distances = location_df.to_numpy()
+    order = np.asfortranarray(np.argsort(distances, axis=0, kind='stable'))
+    sorted_distances = np.asfortranarray(np.take_along_axis(distances, order, axis=0))
+    column_index = {name: i for i, name in enumerate(location_df.columns)}
+    return order, sorted_distances, column_index
+
+location_order, location_sorted, location_column_index = load_location_index()
 
 def recommend_properties_with_scores(property_name, top_n=5):
-    # Combine cosine similarity matrices
-    cosine_sim_matrix = 0.5 * cosine_sim1 + 0.8 * cosine_sim2 + 1 * cosine_sim3
-
     # Get the similarity scores for the property
-    if property_name not in location_df.index:
+    if property_name not in property_index:
         st.error("Property not found in the dataset.")
         return pd.DataFrame(columns=['PropertyName', 'SimilarityScore'])
 
-    sim_scores = list(enumerate(cosine_sim_matrix[location_df.index.get_loc(property_name)]))
-
-    # Sort properties based on the similarity scores
-    sorted_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-
-    # Get the indices and scores of the top_n most similar properties
-    top_indices = [i[0] for i in sorted_scores[1:top_n + 1]]
-    top_scores = [i[1] for i in sorted_scores[1:top_n + 1]]
+    idx = property_index[property_name]
+    sim_row = cosine_sim_matrix[idx]
 
-    # Retrieve the names of the top properties using the indices
-    top_properties = location_df.index[top_indices].tolist()
+    # Find the (top_n+1)-th best score with an O(N) partition and sort only the candidates at or
+    # above it (ties ordered by index, like a stable sort); the property itself is dropped by index.
+    # For a ~250-row matrix this is as fast as a compiled heap kernel, so the page needs no Numba
+    k = min(top_n + 1, len(sim_row))
+    cutoff = np.partition(sim_row, len(sim_row) - k)[len(sim_row) - k]
+    candidates = np.flatnonzero(sim_row >= cutoff)
+    candidates = candidates[np.lexsort((candidates, -sim_row[candidates]))]
+    top_indices = candidates[candidates != idx][:top_n]
 
-    # Create a dataframe with the results
+    # Create a dataframe with the names and scores of the top properties
     recommendations_df = pd.DataFrame({
-        'PropertyName': top_properties,
-        'SimilarityScore': top_scores
+        'PropertyName': location_df.index.values[top_indices],
+        'SimilarityScore': sim_row[top_indices]
     })
 
     return recommendations_df
@@ -48,8 +90,11 @@ radius = st.number_input('Radius in Kms', min_value=0.0, step=0.1)
 
 if st.button('Search'):
     if radius > 0:
-        result_ser = location_df[location_df[selected_location] < radius * 1000][selected_location].sort_values()
-        for key, value in result_ser.items():
+        # The pre-sorted column's prefix below the radius is the answer (same order as a stable sort)
+        col = location_column_index[selected_location]
+        count = np.searchsorted(location_sorted[:, col], radius * 1000)
+        nearby = location_order[:count, col]
+        for key, value in zip(location_df.index.values[nearby], location_sorted[:count, col]):
             st.text(f"{key} {round(value / 1000)} kms")
     else:
         st.warning("Please enter a valid radius.")